@@ -5,10 +5,17 @@ Default = "default"
 import pyecole.dynamics
 import pyecole.instance
 import pyecole.observation
+import pyecole.information
 import pyecole.reward
 import pyecole.scip
 import pyecole.data
 import pyecole.environment
+import pyecole.buffer
+import pyecole.store
+import pyecole.solutionpool
+import pyecole.trajectory
+import pyecole.parallel
+import pyecole.tuning
 import pyecole.random
 import pyecole.typing
 
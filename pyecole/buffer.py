@@ -0,0 +1,79 @@
+import numpy as np
+from typing import *
+
+
+class RecordBuffer:
+    """
+    Growable array of records with a fixed structured dtype.
+
+    Records are appended in amortized constant time into a preallocated
+    structured array whose capacity doubles when full. The filled part is
+    exposed as NumPy views, without copies. Views are only guaranteed to
+    reflect the buffer until the next record is added.
+    """
+    def __init__(self, dtype: np.dtype, capacity: int = 1024) -> None:
+        """
+        Create an empty buffer.
+
+        Parameters
+        ----------
+        dtype:
+            Structured dtype of the records, e.g.
+            `[("step", np.int64), ("value", np.float64)]`.
+        capacity:
+            Number of records initially allocated.
+        """
+        self.data = np.empty(max(capacity, 1), dtype=dtype)
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def reserve(self, capacity: int) -> None:
+        """
+        Make sure at least `capacity` records fit without reallocation.
+        """
+        if capacity > len(self.data):
+            new_capacity = max(capacity, 2 * len(self.data))
+            data = np.empty(new_capacity, dtype=self.data.dtype)
+            data[:self.size] = self.data[:self.size]
+            self.data = data
+
+    def append(self, *values) -> None:
+        """
+        Append a single record given as one value per field.
+        """
+        self.reserve(self.size + 1)
+        self.data[self.size] = values
+        self.size += 1
+
+    def extend(self, **columns) -> None:
+        """
+        Append several records given as one array (or scalar) per field.
+
+        Fields that are not given are left uninitialized.
+        """
+        n = max((np.size(value) for value in columns.values()), default=0)
+        self.reserve(self.size + n)
+        records = self.data[self.size:self.size + n]
+        for name, value in columns.items():
+            records[name] = value
+        self.size += n
+
+    def view(self) -> np.ndarray:
+        """
+        Return a structured view on the filled records.
+        """
+        return self.data[:self.size]
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        """
+        Return a view on one field of the filled records.
+        """
+        return self.data[field][:self.size]
+
+    def clear(self) -> None:
+        """
+        Remove all records, keeping the allocated capacity.
+        """
+        self.size = 0
@@ -0,0 +1,77 @@
+from collections import OrderedDict
+from typing import *
+
+
+class LRUCache:
+    """
+    Bounded in-memory mapping with least-recently-used eviction.
+
+    The cache is bounded by its number of entries, and optionally by the total
+    weight (e.g. the size in bytes) of its entries.
+    """
+    def __init__(self, maxsize: int = 128,
+                 max_weight: Optional[float] = None) -> None:
+        """
+        Create an empty cache.
+
+        Parameters
+        ----------
+        maxsize:
+            Maximum number of entries kept in memory.
+        max_weight:
+            Maximum total weight of the entries (no limit by default).
+        """
+        self.maxsize = maxsize
+        self.max_weight = max_weight
+        self.entries = OrderedDict()
+        self.weights = {}
+        self.weight = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the value stored for `key` and mark it as recently used.
+        """
+        if key not in self.entries:
+            return default
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key: Hashable, value: Any, weight: float = 0) -> None:
+        """
+        Store `value` for `key`, evicting the least recently used entries if
+        the cache is full.
+
+        An entry heavier than `max_weight` on its own is not stored.
+        """
+        self.pop(key)
+        if self.max_weight is not None and weight > self.max_weight:
+            return
+        self.entries[key] = value
+        self.weights[key] = weight
+        self.weight += weight
+        while len(self.entries) > self.maxsize or (
+                self.max_weight is not None and self.weight > self.max_weight):
+            self.pop(next(iter(self.entries)))
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Remove the entry of `key` and return its value, or `default` if there is none.
+        """
+        if key not in self.entries:
+            return default
+        self.weight -= self.weights.pop(key)
+        return self.entries.pop(key)
+
+    def clear(self) -> None:
+        """
+        Remove all entries.
+        """
+        self.entries.clear()
+        self.weights.clear()
+        self.weight = 0
@@ -1,6 +1,8 @@
 import numbers
+import numpy as np
 from .scip import Model
 from .typing import DataFunction
+from .reward.base import BaseRewardFunction
 import ecole.data
 import pyecole
 from typing import *
@@ -73,6 +75,256 @@ class MapFunction(DataFunction):
                 for key, func in self.funcs.items()}
 
 
+class Scheduled(DataFunction):
+    """Data function extracting another function only on scheduled states.
+
+    States are counted from the initial state of the episode (state 0, extracted in `reset`).
+    On states that are not scheduled the wrapped function is not extracted at all, and None is
+    returned instead.
+
+    Parameters
+    ----------
+    func:
+        The data function to extract.
+    every:
+        Extract on every `every` states (states 0, `every`, 2 * `every`, ...).
+        If 0, never extract periodically.
+    on_done:
+        Whether to also extract on terminal states.
+
+    """
+
+    def __init__(self, func: DataFunction, every: int = 1, on_done: bool = True) -> None:
+        self.func = func
+        self.every = every
+        self.on_done = on_done
+        self.requested = False
+        self.n_states = 0
+
+    def request(self) -> None:
+        """
+        Extract on the next state, whatever the schedule.
+        """
+        self.requested = True
+
+    def before_reset(self, model: Model) -> None:
+        """
+        Call `before_reset()` on the wrapped function and restart counting states.
+        """
+        self.func.before_reset(model)
+        self.n_states = 0
+        self.requested = False
+
+    def extract(self, model: Model, done: bool) -> Optional[object]:
+        """
+        Return data from the wrapped function if the state is scheduled, None otherwise.
+        """
+        scheduled = (
+            self.requested
+            or (self.every > 0 and self.n_states % self.every == 0)
+            or (done and self.on_done)
+        )
+        self.n_states += 1
+        if not scheduled:
+            return None
+        self.requested = False
+        return self.func.extract(model, done)
+
+
+# Marker of the slots not yet evaluated in an `ExtractionGraph`.
+_MISSING = object()
+
+
+class ExtractionGraph:
+    """Flat evaluation plan shared by several data extraction functions.
+
+    The aggregates (`VectorFunction`, `MapFunction`) and reward arithmetic expressions
+    (see `pyecole.reward.BaseRewardFunction`) of the given root functions are flattened into a
+    single list of instructions where every distinct leaf function, that is every other data
+    function, appears once.
+    Hence a leaf used several times, for instance in the reward and in the information, is
+    extracted exactly once per state, and arithmetic on rewards is evaluated directly on the
+    extracted values.
+    Functions are identified by object identity.
+
+    Leaves are extracted first, one after the other, and the aggregates are then built from the
+    extracted values.
+
+    Parameters
+    ----------
+    roots:
+        The data extraction functions to evaluate together, for instance the reward,
+        observation, and information functions of an environment.
+
+    """
+
+    LEAF, OP, VECTOR, MAP = range(4)
+
+    def __init__(self, *roots: DataFunction) -> None:
+        self.roots = roots
+        self.instructions = []
+        self.dependencies = []
+        self.slots = {}
+        self.root_slots = [self._add(root) for root in roots]
+        self.leaves = [arg for kind, arg, _ in self.instructions if kind == self.LEAF]
+        self.ops = [arg for kind, arg, _ in self.instructions if kind == self.OP]
+        self.plans = {}
+
+    def _add(self, func) -> int:
+        """Add the instructions computing `func` and return its slot."""
+        if id(func) in self.slots:
+            return self.slots[id(func)]
+        if isinstance(func, VectorFunction):
+            instruction = (self.VECTOR, None, [self._add_operand(f) for f in func.funcs])
+        elif isinstance(func, MapFunction):
+            instruction = (self.MAP, list(func.funcs.keys()),
+                           [self._add_operand(f) for f in func.funcs.values()])
+        elif isinstance(func, BaseRewardFunction) and func.op is not None:
+            instruction = (self.OP, func.op, [self._add_operand(arg) for arg in func.args])
+        else:
+            instruction = (self.LEAF, func, [])
+        slot = len(self.instructions)
+        self.instructions.append(instruction)
+        self.dependencies.append([operand for operand in instruction[2] if operand[0]])
+        self.slots[id(func)] = slot
+        return slot
+
+    def _add_operand(self, operand) -> Tuple[bool, object]:
+        """Return an operand as a `(is_slot, slot_or_constant)` pair."""
+        if hasattr(operand, "extract"):
+            return (True, self._add(operand))
+        return (False, operand)
+
+    def _plan(self, roots: Tuple[int, ...]) -> Tuple[List[int], List[int]]:
+        """Slots of the leaves and of the other instructions needed by the given roots.
+
+        Both lists are in evaluation order.
+        """
+        if roots not in self.plans:
+            needed = set()
+            stack = [self.root_slots[root] for root in roots]
+            while stack:
+                slot = stack.pop()
+                if slot not in needed:
+                    needed.add(slot)
+                    stack.extend(operand for _, operand in self.dependencies[slot])
+            needed = sorted(needed)
+            leaves = [slot for slot in needed if self.instructions[slot][0] == self.LEAF]
+            nodes = [slot for slot in needed if self.instructions[slot][0] != self.LEAF]
+            self.plans[roots] = (leaves, nodes)
+        return self.plans[roots]
+
+    def before_reset(self, model: Model) -> None:
+        """
+        Call `before_reset()` once on every distinct leaf function and reset stateful operations.
+        """
+        for leaf in self.leaves:
+            leaf.before_reset(model)
+        for op in self.ops:
+            if hasattr(op, "reset"):
+                op.reset()
+
+    def evaluate(self, model: Model, done: bool, roots: Sequence[int],
+                 values: Optional[List[object]] = None) -> List[object]:
+        """
+        Evaluate the plan of the requested roots and return the value of every slot.
+
+        Parameters
+        ----------
+        model:
+            The model defining the current state of the solver.
+        done:
+            A flag indicating wether the state is terminal.
+        roots:
+            Indices of the root functions to evaluate.
+        values:
+            Values returned by a previous evaluation on the same state. Slots already evaluated
+            are reused instead of being extracted again, which allows evaluating the roots in
+            several passes.
+
+        """
+        leaves, nodes = self._plan(tuple(roots))
+        if values is None:
+            values = [_MISSING] * len(self.instructions)
+        else:
+            values = list(values)
+        leaves = [slot for slot in leaves if values[slot] is _MISSING]
+        nodes = [slot for slot in nodes if values[slot] is _MISSING]
+        for slot in leaves:
+            values[slot] = self.instructions[slot][1].extract(model, done)
+
+        with np.errstate(all="ignore"):
+            for slot in nodes:
+                kind, arg, operands = self.instructions[slot]
+                operands = [values[o] if is_slot else o for is_slot, o in operands]
+                if kind == self.OP:
+                    # Evaluate on NumPy scalars to get IEEE semantics (e.g. division by zero)
+                    values[slot] = arg(*(np.float64(o) if type(o) in (float, int) else o
+                                         for o in operands))
+                elif kind == self.VECTOR:
+                    values[slot] = operands
+                else:
+                    values[slot] = dict(zip(arg, operands))
+        return values
+
+    def root_values(self, values: List[object], roots: Sequence[int]) -> List[object]:
+        """
+        Return the data of the requested roots from the values returned by `evaluate`.
+        """
+        return [values[self.root_slots[root]] for root in roots]
+
+    def extract(self, model: Model, done: bool,
+                roots: Optional[Sequence[int]] = None) -> List[object]:
+        """
+        Evaluate the plan and return the data of the requested root functions.
+
+        Parameters
+        ----------
+        model:
+            The model defining the current state of the solver.
+        done:
+            A flag indicating wether the state is terminal.
+        roots:
+            Indices of the root functions to evaluate (all by default).
+            Leaves only needed by the other roots are not extracted.
+
+        """
+        roots = tuple(range(len(self.roots)) if roots is None else roots)
+        return self.root_values(self.evaluate(model, done, roots), roots)
+
+
+class CompiledFunction(DataFunction):
+    """Data function evaluating a nested aggregate through a flat `ExtractionGraph`.
+
+    This is a drop-in replacement for the function tree returned by `parse`, which avoids the
+    recursive traversal of the aggregate at every extraction.
+
+    Parameters
+    ----------
+    something:
+        Object to parse, as in `parse`.
+    default:
+        Objet to return for when something is identified as asking for the environment specific
+        default.
+
+    """
+
+    def __init__(self, something, default=None) -> None:
+        self.graph = ExtractionGraph(parse(something, default))
+
+    def before_reset(self, model: Model) -> None:
+        """
+        Call `before_reset()` once on every distinct function of the aggregate.
+        """
+        self.graph.before_reset(model)
+
+    def extract(self, model: Model, done: bool) -> object:
+        """
+        Return data with the structure of the parsed aggregate.
+        """
+        return self.graph.extract(model, done)[0]
+
+
 def parse(something, default):
     """Recursively parse data function aggregates into their corresponding functions.
 
@@ -1,3 +1,4 @@
+import ecole
 import ecole.dynamics
 from ..typing import Dynamics
 from ..scip.model import Model
@@ -5,6 +6,10 @@ from ..random import RandomEngine
 from typing import *
 import numpy as np
 
+# SCIP parameters seeded by Ecole at the start of every episode.
+_SEED_PARAMS = ("permutationseed", "randomseedshift", "lpseed")
+
+
 class BranchingDynamics(Dynamics):
     """
     Single variable branching Dynamics.
@@ -14,8 +19,15 @@ class BranchingDynamics(Dynamics):
     The dynamics give the control back to the user every time the callback would be called.
     The user receives as an action set the list of branching candidates, and is expected to select
     one of them as the action.
+
+    Control can be given back only on some of the branching decisions. The other decisions are
+    taken by the default SCIP branching rule, without leaving the dynamics.
     """
-    def __init__(self, pseudo_candidates: bool = False) -> None:
+    def __init__(self, pseudo_candidates: bool = False,
+                 min_candidates: int = 1,
+                 max_depth: int = -1,
+                 sample_probability: float = 1.0,
+                 predicate: Optional[Callable[[Model, np.ndarray], bool]] = None) -> None:
         """
         Create new dynamics.
 
@@ -24,15 +36,55 @@ class BranchingDynamics(Dynamics):
         pseudo_candidates:
             Whether the action set contains pseudo branching variable candidates (``SCIPgetPseudoBranchCands``)
             or LP branching variable candidates (``SCIPgetPseudoBranchCands``).
+        min_candidates:
+            Only give back control on decisions with at least this many branching candidates.
+        max_depth:
+            Only give back control on nodes up to this depth (or -1 for no limit).
+        sample_probability:
+            Probability of giving back control on a decision satisfying the other conditions.
+            Sampling uses the random state set by :py:meth:`set_dynamics_random_state`.
+        predicate:
+            An additional callable receiving the model and the action set, and returning whether
+            control should be given back on the decision.
         """
         self.dyn = ecole.dynamics.BranchingDynamics(pseudo_candidates)
+        self.min_candidates = min_candidates
+        self.max_depth = max_depth
+        self.sample_probability = sample_probability
+        self.predicate = predicate
+        self.rng = np.random.default_rng()
+
+    def _selective(self) -> bool:
+        return (self.min_candidates > 1 or self.max_depth >= 0
+                or self.sample_probability < 1.0 or self.predicate is not None)
+
+    def _hand_back(self, model: Model, action_set: np.ndarray) -> bool:
+        """Whether control is given back to the user on the current decision."""
+        if len(action_set) < self.min_candidates:
+            return False
+        if self.max_depth >= 0 and model.as_pyscipopt().getDepth() > self.max_depth:
+            return False
+        if self.predicate is not None and not self.predicate(model, action_set):
+            return False
+        if self.sample_probability < 1.0 and self.rng.random() >= self.sample_probability:
+            return False
+        return True
+
+    def _skip_decisions(self, model: Model, done: bool, action_set: Optional[np.ndarray]
+                        ) -> Tuple[bool, Optional[np.ndarray]]:
+        """Branch with the default SCIP rule until a decision is handed back or solving ends."""
+        if not self._selective():
+            return done, action_set
+        while not done and not self._hand_back(model, action_set):
+            done, action_set = self.dyn.step_dynamics(model.model, ecole.Default)
+        return done, action_set
 
     def reset_dynamics(self, model: Model) -> Tuple[bool, Optional[np.ndarray]]:
         """
         Start solving up to first branching node.
 
         Start solving with SCIP defaults (``SCIPsolve``) and give back control to the user on the
-        first branching decision.
+        first branching decision handed back.
         Users can inherit from this dynamics to change the defaults settings such as presolving
         and cutting planes.
 
@@ -53,13 +105,15 @@ class BranchingDynamics(Dynamics):
                 (``SCIPvarGetProbindex``).
                 Variable ordering in the ``action_set`` is arbitrary.
         """
-        return self.dyn.reset_dynamics(model.model)
+        done, action_set = self.dyn.reset_dynamics(model.model)
+        return self._skip_decisions(model, done, action_set)
     
     def set_dynamics_random_state(self, model: Model, rng: RandomEngine) -> None:
         """
         Set seeds on the :py:class:`Model`.
 
-        Set seed parameters, including permutation, LP, and shift.
+        Set seed parameters, including permutation, LP, and shift, and seed the sampling of
+        handed-back decisions.
 
         Parameters
         ----------
@@ -69,6 +123,11 @@ class BranchingDynamics(Dynamics):
                 The source of randomness. Passed by the environment.
         """
         self.dyn.set_dynamics_random_state(model.model, rng.generator)
+        if self.sample_probability < 1.0:
+            # Derived from the seeds just set, so that the random state of the environment is not
+            # advanced and the seeds of the next episodes are unchanged
+            self.rng = np.random.default_rng([model.get_param(f"randomization/{name}")
+                                              for name in _SEED_PARAMS])
     
     def step_dynamics(self, model: Model, action: int
                       ) -> Tuple[bool, Optional[np.ndarray]]:
@@ -76,7 +135,8 @@ class BranchingDynamics(Dynamics):
         Branch and resume solving until next branching.
 
         Branching is done on a single variable using ``SCIPbranchVar``.
-        The control is given back to the user on the next branching decision or when done.
+        The control is given back to the user on the next branching decision handed back, or when
+        done.
 
         Parameters
         ----------
@@ -98,6 +158,7 @@ class BranchingDynamics(Dynamics):
                 (``SCIPvarGetProbindex``).
                 Variables ordering in the ``action_set`` is arbitrary.
         """
-        return self.dyn.step_dynamics(model.model, action)
+        done, action_set = self.dyn.step_dynamics(model.model, action)
+        return self._skip_decisions(model, done, action_set)
     
     
\ No newline at end of file
@@ -1,9 +1,37 @@
 import ecole.dynamics
+import multiprocessing
+import os
+import queue
+import signal
+import tempfile
+import time
+import numpy as np
 from ..typing import Dynamics
-from ..scip.model import Model
+from ..scip.model import Model, _default_params
 from ..random import RandomEngine
+from ..information.solverstats import SolverStats, _MISSING_STATS
 from typing import *
 
+
+def _race_worker(filepath: str, params: Dict[str, Union[bool, int, float, str]],
+                 index: int, results: multiprocessing.Queue,
+                 ready: multiprocessing.Event, stop: multiprocessing.Event) -> None:
+    # Interruptions are only sent once the handler is installed and `ready` is set. Before that,
+    # the race is stopped with `stop`, which is set before `ready` is checked.
+    signal.signal(signal.SIGINT, lambda signum, frame: None)
+    ready.set()
+    model = Model.from_file(filepath)
+    model.set_messagehdlr_quiet(True)
+    model.set_params(params)
+    # SCIP catches the interruptions received during the solve and stops with a user interrupt
+    # status.
+    model.set_param("misc/catchctrlc", True)
+    if not stop.is_set():
+        model.solve()
+    results.put((index, SolverStats().extract(model, True), model.is_solved,
+                 model.as_pyscipopt().getStatus()))
+
+
 class ConfiguringDynamics(Dynamics):
     """
     Setting solving parameters Dynamics.
@@ -70,4 +98,107 @@ class ConfiguringDynamics(Dynamics):
                 Unused.
         """
         return self.dyn.step_dynamics(model.model, action)
-        
+
+    def race(self, model: Model,
+             configurations: Sequence[Dict[str, Union[bool, int, float, str]]],
+             time_limit: Optional[float] = None,
+             grace_period: float = 10.0
+             ) -> Tuple[int, np.ndarray, List[str]]:
+        """
+        Solve copies of the instance with several configurations at once and keep the fastest.
+
+        Every configuration is solved in its own worker process, on a copy of the original problem
+        of `model` with its current parameters updated with the configuration.
+        As soon as one of them solves the instance, the others are interrupted and report the
+        statistics reached so far.
+        If none finishes within the time limit, the winner is the one with the smallest gap.
+        The state of `model` is left untouched.
+
+        Parameters
+        ----------
+            model:
+                The instance to solve.
+            configurations:
+                A list of mappings of parameter names and values, one per racing solve.
+            time_limit:
+                Time limit in seconds of every solve (``limits/time``).
+            grace_period:
+                Seconds given to interrupted solves to report their statistics before they are
+                terminated.
+
+        Returns
+        -------
+            winner:
+                The index of the winning configuration.
+            stats:
+                The statistics of every configuration, with layout
+                :py:attr:`pyecole.information.SolverStats.dtype`.
+                Solves terminated without reporting have default statistics.
+            statuses:
+                The SCIP status of every solve (for instance ``"optimal"`` for the winner and
+                ``"userinterrupt"`` for the interrupted ones).
+        """
+        n_configs = len(configurations)
+        stats = np.array([_MISSING_STATS] * n_configs, dtype=SolverStats.dtype)
+        statuses = ["unknown"] * n_configs
+        solved = np.zeros(n_configs, dtype=bool)
+        # Workers read the problem with default parameters, so only the changed ones are sent.
+        defaults = _default_params()
+        base_params = {name: value for name, value in model.get_params().items()
+                       if defaults.get(name) != value}
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, "instance.cip")
+            model.write_problem(filepath)
+            results = multiprocessing.Queue()
+            stop = multiprocessing.Event()
+            processes = []
+            ready = []
+            for index, configuration in enumerate(configurations):
+                params = {**base_params, **configuration}
+                if time_limit is not None:
+                    params["limits/time"] = time_limit
+                ready.append(multiprocessing.Event())
+                process = multiprocessing.Process(
+                    target=_race_worker,
+                    args=(filepath, params, index, results, ready[-1], stop),
+                    daemon=True)
+                process.start()
+                processes.append(process)
+
+            n_reported = 0
+            interrupted_at = None
+            try:
+                while n_reported < n_configs:
+                    # Checked before waiting, so that the reports of exited workers are received.
+                    alive = any(process.is_alive() for process in processes)
+                    try:
+                        index, record, is_solved, status = results.get(timeout=0.1)
+                    except queue.Empty:
+                        # Workers that crashed or ignored the interruption never report.
+                        if not alive:
+                            break
+                        if (interrupted_at is not None
+                                and time.perf_counter() - interrupted_at > grace_period):
+                            break
+                        continue
+                    stats[index], solved[index], statuses[index] = record, is_solved, status
+                    n_reported += 1
+                    if is_solved and interrupted_at is None:
+                        interrupted_at = time.perf_counter()
+                        stop.set()
+                        for process, started in zip(processes, ready):
+                            if process.is_alive() and started.is_set():
+                                os.kill(process.pid, signal.SIGINT)
+            finally:
+                for process in processes:
+                    if process.is_alive():
+                        process.terminate()
+                    process.join()
+
+        if solved.any():
+            solving_time = np.where(solved, stats["solving_time"], np.inf)
+            winner = int(np.argmin(solving_time))
+        else:
+            gap = np.where(np.isnan(stats["gap"]), np.inf, stats["gap"])
+            winner = int(np.argmin(gap))
+        return winner, stats, statuses
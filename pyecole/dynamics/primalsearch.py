@@ -40,6 +40,7 @@ class PrimalSearchDynamics(Dynamics):
                                                        depth_freq,
                                                        depth_start,
                                                        depth_stop)
+        self.batch_results = None
         
     def reset_dynamics(self, model: Model) -> Tuple[bool, Optional[np.ndarray]]:
         """
@@ -98,6 +99,9 @@ class PrimalSearchDynamics(Dynamics):
                 The state of the Markov Decision Process. Passed by the environment.
             action:
                 A subset of the variables given in the action set, and their assigned values.
+                A batch of assignments can be given instead as a pair of matrices, stacking the
+                indices and values of one candidate per row (see :py:meth:`probe_batch`).
+                The batch counts as one trial, and its results are stored in ``batch_results``.
 
         Returns
         -------
@@ -106,5 +110,90 @@ class PrimalSearchDynamics(Dynamics):
             action_set:
                 List of non-fixed discrete variables (``SCIPgetPseudoBranchCands``).
         """
+        if isinstance(action, tuple) and np.ndim(action[0]) == 2:
+            self.batch_results = self.probe_batch(model, *action)
+            # The batch replaces the trial, which is consumed with an empty assignment
+            action = (np.empty(0, dtype=np.uintp), np.empty(0, dtype=np.float64))
         return self.dyn.step_dynamics(model.model, action)
+
+    def probe_batch(self, model: Model, indices: np.ndarray, values: np.ndarray,
+                    propagation_rounds: int = -1, lp_iterations: int = -1
+                    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Evaluate a batch of partial primal solutions at the current node.
+
+        Each candidate is evaluated as a trial: its variables are fixed in probing mode, the
+        fixings are propagated, and the rest of the assignment is deduced by solving the probing
+        LP. Feasible solutions are added to the solution storage of SCIP.
+        Fixings shared by all the candidates are applied and propagated once, at a common probing
+        node that is reused by every candidate.
+
+        Parameters
+        ----------
+            model:
+                The state of the Markov Decision Process, while the heuristic has control.
+            indices:
+                A matrix with the variable indices (values of the action set) of one candidate
+                per row. Entries equal to -1 are padding and ignored.
+            values:
+                A matrix of the same shape with the values assigned to the variables.
+            propagation_rounds:
+                Maximum number of propagation rounds (or -1 for no limit).
+            lp_iterations:
+                Maximum number of iterations of every probing LP (or -1 for no limit).
+
+        Returns
+        -------
+            feasible:
+                Whether every candidate led to a feasible solution.
+            objective:
+                The objective value, in the original problem, of the solution of every candidate
+                (`NaN` for infeasible ones).
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64)
+        n_candidates = len(indices)
+        feasible = np.zeros(n_candidates, dtype=bool)
+        objective = np.full(n_candidates, np.nan)
+        if n_candidates == 0:
+            return feasible, objective
+
+        rows = [{(int(i), float(v)) for i, v in zip(row_indices, row_values) if i >= 0}
+                for row_indices, row_values in zip(indices, values)]
+        shared = set.intersection(*rows)
+
+        scip = model.as_pyscipopt()
+        variables = scip.getVars(transformed=True)
+
+        def fix(assignment) -> bool:
+            for index, value in assignment:
+                var = variables[index]
+                if not var.getLbLocal() <= value <= var.getUbLocal():
+                    return False
+                if var.getLbLocal() < var.getUbLocal():
+                    scip.fixVarProbing(var, value)
+            cutoff, _ = scip.propagateProbing(propagation_rounds)
+            return not cutoff
+
+        scip.startProbing()
+        try:
+            scip.newProbingNode()
+            if not fix(shared):
+                return feasible, objective
+            for candidate, row in enumerate(rows):
+                scip.newProbingNode()
+                if fix(row - shared):
+                    lperror, cutoff = scip.solveProbingLP(lp_iterations)
+                    if not lperror and not cutoff:
+                        solution = scip.createSol()
+                        for var in variables:
+                            scip.setSolVal(solution, var, var.getLPSol())
+                        feasible[candidate] = scip.trySol(solution, printreason=False, free=False)
+                        if feasible[candidate]:
+                            objective[candidate] = scip.getSolObjVal(solution)
+                        scip.freeSol(solution)
+                scip.backtrackProbing(1)
+        finally:
+            scip.endProbing()
+        return feasible, objective
         
@@ -1,18 +1,50 @@
 """Ecole collection of environments."""
 
 import ecole
+import hashlib
+import json
+import numbers
 import os
+import numpy as np
+from concurrent.futures import Future, ThreadPoolExecutor
 import pyecole
 import pyecole.observation
 import pyecole.reward
 import pyecole.dynamics
-from .scip import Model
-from .data import parse
+from .scip import Model, ModelCache
+from .solutionpool import SolutionPool
+from .store import KeyValueStore
+from .buffer import RecordBuffer
+from .cache import LRUCache
+from .data import parse, ExtractionGraph
+from .reward.base import BaseRewardFunction
 from .random import RandomEngine
+from .trajectory import Trajectory
 from typing import *
 from .typing import DataFunction, Dynamics
 
 
+# Fingerprints of the instance files read by environments, keyed by the absolute path,
+# modification time, and size of the files.
+_FILE_FINGERPRINTS = LRUCache(4096)
+
+
+def _file_fingerprints(filepath: os.PathLike) -> Dict[bool, str]:
+    """Fingerprint cache shared by all the models read from the same instance file.
+
+    The dictionary itself is shared, so that a fingerprint computed on one model is
+    available to the models read from the file afterwards without hashing it again.
+    """
+    path = os.path.abspath(filepath)
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    fingerprints = _FILE_FINGERPRINTS.get(key)
+    if fingerprints is None:
+        fingerprints = {}
+        _FILE_FINGERPRINTS.put(key, fingerprints)
+    return fingerprints
+
+
 class Environment:
     """Ecole Partially Observable Markov Decision Process (POMDP).
 
@@ -38,6 +70,10 @@ class Environment:
         reward_function=pyecole.Default,
         information_function=pyecole.Default,
         scip_params: Optional[Dict[str, Union[bool, int, float, str]]]=None,
+        shared_extraction: bool = False,
+        defer_information: bool = False,
+        trajectory: Optional[Trajectory] = None,
+        model_cache: Optional[ModelCache] = None,
         **dynamics_kwargs
     ) -> None:
         """Create a new environment object.
@@ -55,6 +91,24 @@ class Environment:
             additional information returned by `reset` and `step`.
         scip_params:
             Parameters set on the underlying `pyecole.scip.Model` at the start of every episode.
+        shared_extraction:
+            If true, the reward, observation, and information functions are compiled together
+            into a `pyecole.data.ExtractionGraph`, so that every distinct function they are made
+            of is extracted once per state, even when used in several places.
+        defer_information:
+            If true, the information is extracted in a background thread while the agent decides
+            on its next action, and `reset` and `step` return it as a
+            `concurrent.futures.Future`.
+            The environment waits for the extraction to finish before changing the state of the
+            solver again.
+            Wrap information functions in `pyecole.data.Scheduled` to extract them only on some
+            states.
+        trajectory:
+            A `pyecole.trajectory.Trajectory` in which a new episode is started on every `reset`
+            and the reward and done flag of every `step` are appended.
+        model_cache:
+            A `pyecole.scip.ModelCache` from which `reset` takes copies of the problems of
+            instance files, so that every file is only parsed once.
         **dynamics_kwargs:
             Other arguments are passed to the constructor of the `pyecole.typing.Dynamics`.
 
@@ -68,6 +122,16 @@ class Environment:
             information_function, self.__DefaultInformationFunction__()
         )
         self.scip_params = scip_params if scip_params is not None else {}
+        if shared_extraction:
+            self.extraction_graph = ExtractionGraph(
+                self.reward_function, self.observation_function, self.information_function
+            )
+        else:
+            self.extraction_graph = None
+        self.trajectory = trajectory
+        self.model_cache = model_cache
+        self.information_executor = ThreadPoolExecutor(1) if defer_information else None
+        self.pending_information = None
         self.model = None
         self.dynamics = self.__Dynamics__(**dynamics_kwargs)
         self.can_transition = False
@@ -112,32 +176,24 @@ class Environment:
             insights about the environment.
 
         """
+        self._wait_information()
         self.can_transition = True
         try:
-            if isinstance(instance, Model):
-                self.model = instance.copy_orig()
-            else:
-                self.model = Model.from_file(instance)
-            self.model.set_params(self.scip_params)
+            self._set_up_model(instance)
 
             self.dynamics.set_dynamics_random_state(self.model, self.rng)
 
             # Reset data extraction functions
-            self.reward_function.before_reset(self.model)
-            self.observation_function.before_reset(self.model)
-            self.information_function.before_reset(self.model)
+            self._before_reset()
 
             # Place the environment in its initial state
             done, action_set = self.dynamics.reset_dynamics(self.model)
             self.can_transition = not done
 
             # Extract additional information to be returned by reset
-            reward_offset = self.reward_function.extract(self.model, done)
-            if not done:
-                observation = self.observation_function.extract(self.model, done)
-            else:
-                observation = None
-            information = self.information_function.extract(self.model, done)
+            reward_offset, observation, information = self._extract(done)
+            if self.trajectory is not None:
+                self.trajectory.start_episode()
 
             return observation, action_set, reward_offset, done, information
         except Exception as e:
@@ -182,24 +238,92 @@ class Environment:
         if not self.can_transition:
             raise ecole.MarkovError("Environment need to be reset.")
 
+        self._wait_information()
         try:
             # Transition the environment to the next state
             done, action_set = self.dynamics.step_dynamics(self.model, action)
             self.can_transition = not done
 
             # Extract additional information to be returned by step
-            reward = self.reward_function.extract(self.model, done)
-            if not done:
-                observation = self.observation_function.extract(self.model, done)
-            else:
-                observation = None
-            information = self.information_function.extract(self.model, done)
+            reward, observation, information = self._extract(done)
+            if self.trajectory is not None:
+                self.trajectory.append(reward, done)
 
             return observation, action_set, reward, done, information
         except Exception as e:
             self.can_transition = False
             raise e
 
+    def _set_up_model(self, instance: Union[Model, os.PathLike]) -> None:
+        """Create the model of a new episode, before the dynamics are reset."""
+        if isinstance(instance, Model):
+            self.model = instance.copy_orig()
+        elif self.model_cache is not None:
+            self.model = self.model_cache.get(instance)
+        else:
+            self.model = Model.from_file(instance)
+            self.model.fingerprints = _file_fingerprints(instance)
+        self.model.set_params(self.scip_params)
+
+    def _before_reset(self) -> None:
+        """Call `before_reset()` on the data extraction functions."""
+        if self.extraction_graph is not None:
+            self.extraction_graph.before_reset(self.model)
+        else:
+            self.reward_function.before_reset(self.model)
+            self.observation_function.before_reset(self.model)
+            self.information_function.before_reset(self.model)
+
+    def _extract(self, done: bool) -> Tuple[float, object, object]:
+        """Extract the reward, observation (None on terminal states), and information."""
+        if self.extraction_graph is not None:
+            graph, model = self.extraction_graph, self.model
+            roots = (0, 2) if done else (0, 1, 2)
+            if self.information_executor is None:
+                values = graph.extract(model, done, roots)
+            else:
+                # Functions shared with the information are only extracted once, in this pass
+                evaluated = graph.evaluate(model, done, roots[:-1])
+                values = graph.root_values(evaluated, roots[:-1])
+                values.append(self._submit_information(
+                    lambda: graph.root_values(graph.evaluate(model, done, (2,), evaluated),
+                                              (2,))[0]
+                ))
+            if done:
+                values.insert(1, None)
+            return tuple(values)
+
+        reward = self.reward_function.extract(self.model, done)
+        if not done:
+            observation = self.observation_function.extract(self.model, done)
+        else:
+            observation = None
+        if self.information_executor is None:
+            information = self.information_function.extract(self.model, done)
+        else:
+            model = self.model
+            information = self._submit_information(
+                lambda: self.information_function.extract(model, done)
+            )
+        return reward, observation, information
+
+    def _submit_information(self, extract: Callable[[], object]) -> Future:
+        """Start extracting the information in the background."""
+        self.pending_information = self.information_executor.submit(extract)
+        return self.pending_information
+
+    def _wait_information(self) -> None:
+        """
+        Wait for the information of the current state, before the state changes.
+
+        Errors raised while extracting the information are raised again here.
+        """
+        if self.pending_information is not None:
+            try:
+                self.pending_information.result()
+            finally:
+                self.pending_information = None
+
     def seed(self, value: int) -> None:
         """Set the random seed of the environment.
 
@@ -212,17 +336,292 @@ class Environment:
         """
         self.rng.seed(value)
 
+    def close(self) -> None:
+        """Shut down the thread extracting deferred information, if any.
+
+        Waits for the information being extracted in the background to be ready,
+        and raises its error, if any, once the thread is shut down.
+        """
+        try:
+            self._wait_information()
+        finally:
+            if self.information_executor is not None:
+                self.information_executor.shutdown()
+                self.information_executor = None
+
 
 class Branching(Environment):
     __Dynamics__ = pyecole.dynamics.BranchingDynamics
     __DefaultObservationFunction__ = pyecole.observation.NodeBipartite
 
+    # Layout of the transitions collected by `step_until` and `run_episode`.
+    rollout_dtype = np.dtype([("action", np.int64), ("reward", np.float64)])
+
+    def step_until(
+        self,
+        observation,
+        action_set: Optional[np.ndarray],
+        policy: Callable[[object, Optional[np.ndarray]], int],
+        max_steps: Optional[int] = None,
+        records: Optional[RecordBuffer] = None,
+    ):
+        """Take the actions chosen by a policy until the episode ends.
+
+        The loop runs in place of repeated calls to :meth:`step`: the policy is called directly
+        on the observation and action set, and the transitions are appended to a preallocated
+        `pyecole.buffer.RecordBuffer` with layout `Branching.rollout_dtype`.
+        Default actions (such as ``ecole.Default``) are recorded as -1.
+
+        Parameters
+        ----------
+        observation:
+            The observation of the current state, as returned by :meth:`reset` or :meth:`step`.
+        action_set:
+            The action set of the current state.
+        policy:
+            A callable returning the action to take given an observation and an action set.
+        max_steps:
+            Maximum number of transitions to take (no limit by default).
+        records:
+            The buffer to append the transitions to. A new one is created if not given.
+
+        Returns
+        -------
+        observation:
+            The observation extracted from the last state.
+        action_set:
+            The action set of the last state.
+        done:
+            Whether the last state is terminal.
+            If false, the episode was interrupted by `max_steps` and can be continued.
+        info:
+            The information extracted from the last state.
+        records:
+            The buffer the transitions were appended to.
+
+        """
+        if not self.can_transition:
+            raise ecole.MarkovError("Environment need to be reset.")
+        if records is None:
+            records = RecordBuffer(Branching.rollout_dtype)
+
+        done = False
+        information = None
+        n_steps = 0
+        while not done and (max_steps is None or n_steps < max_steps):
+            action = policy(observation, action_set)
+            self._wait_information()
+            try:
+                done, action_set = self.dynamics.step_dynamics(self.model, action)
+                self.can_transition = not done
+                reward, observation, information = self._extract(done)
+            except Exception as e:
+                self.can_transition = False
+                raise e
+            records.append(action if isinstance(action, numbers.Integral) else -1, reward)
+            if self.trajectory is not None:
+                self.trajectory.append(reward, done)
+            n_steps += 1
+        return observation, action_set, done, information, records
+
+    def run_episode(
+        self,
+        instance: Union[Model, os.PathLike],
+        policy: Callable[[object, Optional[np.ndarray]], int],
+        max_steps: Optional[int] = None,
+        records: Optional[RecordBuffer] = None,
+    ):
+        """Run a full episode with a policy.
+
+        Equivalent to calling :meth:`reset` followed by :meth:`step_until`.
+
+        Parameters
+        ----------
+        instance:
+            The instance to solve, as in :meth:`reset`.
+        policy:
+            A callable returning the action to take given an observation and an action set.
+        max_steps:
+            Maximum number of transitions to take (no limit by default).
+        records:
+            A buffer to collect the transitions into. It is cleared first, so that the same
+            buffer can be reused across episodes without reallocation.
+
+        Returns
+        -------
+        records:
+            The transitions of the episode, with layout `Branching.rollout_dtype`.
+        reward_offset:
+            The reward offset returned by :meth:`reset`.
+        done:
+            Whether the episode reached a terminal state.
+
+        """
+        if records is None:
+            records = RecordBuffer(Branching.rollout_dtype)
+        else:
+            records.clear()
+        observation, action_set, reward_offset, done, _ = self.reset(instance)
+        if not done:
+            _, _, done, _, _ = self.step_until(
+                observation, action_set, policy, max_steps, records
+            )
+        return records, reward_offset, done
+
+
+def _has_stateful_op(func) -> bool:
+    """Whether a reward expression contains an operation with state across extractions."""
+    if not isinstance(func, BaseRewardFunction) or func.op is None:
+        return False
+    return hasattr(func.op, "reset") or any(_has_stateful_op(arg) for arg in func.args)
+
 
 class Configuring(Environment):
     __Dynamics__ = pyecole.dynamics.ConfiguringDynamics
 
+    def __init__(
+        self,
+        observation_function=pyecole.Default,
+        reward_function=pyecole.Default,
+        information_function=pyecole.Default,
+        scip_params: Optional[Dict[str, Union[bool, int, float, str]]]=None,
+        result_cache: Optional[Union[os.PathLike, KeyValueStore]] = None,
+        **kwargs
+    ) -> None:
+        """Create a new environment object.
+
+        Parameters
+        ----------
+        result_cache:
+            Either a `pyecole.store.KeyValueStore` or the path of its database file, where the
+            reward and information of every solve are stored.
+            A configuration already evaluated on the same instance, with the same parameters and
+            random seeds, returns the stored reward and information without solving.
+            The information must be picklable.
+            Since the reward function is not extracted on those steps, reward functions with
+            state carried across extractions (e.g. built with `cumsum`) are rejected.
+        **kwargs:
+            Other arguments are passed to the constructor of `Environment`.
+
+        """
+        super().__init__(observation_function, reward_function, information_function,
+                         scip_params, **kwargs)
+        if result_cache is not None and _has_stateful_op(self.reward_function):
+            raise ValueError("Stateful reward functions cannot be used with a result cache.")
+        if result_cache is None or isinstance(result_cache, KeyValueStore):
+            self.result_cache = result_cache
+        else:
+            self.result_cache = KeyValueStore(result_cache)
+        self.instance_key = None
+
+    def reset(self, instance: Union[Model, os.PathLike]):
+        """Start a new episode.
+
+        See `Environment.reset`.
+        """
+        results = super().reset(instance)
+        if self.result_cache is not None:
+            self.instance_key = self.model.fingerprint()
+        return results
+
+    def _result_key(self, action: Dict[str, Union[bool, int, float, str]]) -> Optional[str]:
+        """Key of the solve of the current instance with the action, None if not cacheable."""
+        if self.result_cache is None or self.instance_key is None:
+            return None
+        # The model parameters include the scip_params and the seeds set in reset
+        params = {**self.model.get_params(), **action}
+        canonical = json.dumps(params, sort_keys=True, default=str)
+        return hashlib.sha256(f"{self.instance_key}:{canonical}".encode()).hexdigest()
+
+    def step(self, action):
+        """Set the parameters and solve the instance.
+
+        See `Environment.step`.
+        Results found in the `result_cache` are returned without solving, and without extracting
+        the reward and information functions.
+        When information is deferred, they are returned in a completed `Future`.
+        """
+        if not self.can_transition:
+            raise ecole.MarkovError("Environment need to be reset.")
+        key = self._result_key(action)
+        if key is not None:
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                self._wait_information()
+                self.can_transition = False
+                reward, information = cached
+                if self.information_executor is not None:
+                    # Returned like deferred information extracted by a solve
+                    future = Future()
+                    future.set_result(information)
+                    information = future
+                if self.trajectory is not None:
+                    self.trajectory.append(reward, True)
+                return None, None, reward, True, information
+
+        observation, action_set, reward, done, information = super().step(action)
+        if key is not None and done:
+            if isinstance(information, Future):
+                information = information.result()
+            self.result_cache.put(key, (reward, information))
+        return observation, action_set, reward, done, information
+
 
 class PrimalSearch(Environment):
     __Dynamics__ = pyecole.dynamics.PrimalSearchDynamics
     __DefaultObservationFunction__ = pyecole.observation.NodeBipartite
 
+    def __init__(
+        self,
+        observation_function=pyecole.Default,
+        reward_function=pyecole.Default,
+        information_function=pyecole.Default,
+        scip_params: Optional[Dict[str, Union[bool, int, float, str]]]=None,
+        solution_pool: Optional[SolutionPool] = None,
+        warm_start: bool = True,
+        **kwargs
+    ) -> None:
+        """Create a new environment object.
+
+        Parameters
+        ----------
+        solution_pool:
+            A `pyecole.solutionpool.SolutionPool` where the best solutions of every episode are
+            collected, at the end of the episode or when the next one starts.
+        warm_start:
+            Whether the solutions in the pool for the instance are added as starting solutions
+            on `reset`, so that episodes start with the best known incumbent.
+        **kwargs:
+            Other arguments are passed to the constructor of `Environment`.
+
+        """
+        super().__init__(observation_function, reward_function, information_function,
+                         scip_params, **kwargs)
+        self.solution_pool = solution_pool
+        self.warm_start = warm_start
+        self.instance_key = None
+
+    def _collect_solutions(self) -> None:
+        """Add the solutions of the current episode to the pool, once."""
+        if self.solution_pool is not None and self.instance_key is not None:
+            self.solution_pool.collect(self.model, self.instance_key)
+            self.instance_key = None
+
+    def _set_up_model(self, instance: Union[Model, os.PathLike]) -> None:
+        self._collect_solutions()
+        super()._set_up_model(instance)
+        if self.solution_pool is not None:
+            self.instance_key = self.model.fingerprint()
+            if self.warm_start:
+                self.solution_pool.warm_start(self.model, self.instance_key)
+
+    def step(self, action):
+        """Transition from one state to another.
+
+        See `Environment.step`.
+        """
+        results = super().step(action)
+        if results[3]:
+            self._collect_solutions()
+        return results
+
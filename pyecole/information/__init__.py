@@ -0,0 +1,6 @@
+from ..typing import InformationFunction
+from .solverstats import SolverStats
+
+__all__ = ["InformationFunction",
+           "SolverStats",
+           ]
@@ -0,0 +1,65 @@
+import ecole.scip
+import numpy as np
+from ..scip import Model
+from ..typing import InformationFunction
+
+# Statistics of a model that has not started solving.
+_MISSING_STATS = (-1, -1, -1, np.nan, np.nan, np.nan, -1, np.nan)
+
+
+class SolverStats(InformationFunction):
+    """
+    Snapshot of the solver statistics.
+
+    This information function extracts, in a single pass over the model, the
+    main counters of the solving process into a NumPy record with the fixed
+    layout `SolverStats.dtype`:
+
+    - `n_nodes`: number of processed branch-and-bound nodes,
+    - `n_lp_iterations`: total number of LP iterations,
+    - `depth`: depth of the current node,
+    - `gap`: relative gap between primal and dual bound,
+    - `primal_bound` and `dual_bound`: current global bounds,
+    - `n_open_nodes`: number of nodes left to process (0 once solved),
+    - `solving_time`: solving time in seconds as measured by SCIP.
+
+    Statistics only available once solving has started are `NaN` (or -1 for
+    integer fields) before that.
+    """
+    dtype = np.dtype([("n_nodes", np.int64),
+                      ("n_lp_iterations", np.int64),
+                      ("depth", np.int64),
+                      ("gap", np.float64),
+                      ("primal_bound", np.float64),
+                      ("dual_bound", np.float64),
+                      ("n_open_nodes", np.int64),
+                      ("solving_time", np.float64)])
+
+    def before_reset(self, model: Model) -> None:
+        """
+        Do nothing.
+        """
+        pass
+
+    def extract(self, model: Model, done: bool) -> np.ndarray:
+        """
+        Return a zero-dimensional record array of statistics.
+        """
+        stats = np.array(_MISSING_STATS, dtype=SolverStats.dtype)
+        if model.stage not in (ecole.scip.Stage.Solving, ecole.scip.Stage.Solved):
+            return stats
+        scip = model.as_pyscipopt()
+        # The node queues are only available while solving
+        if model.stage == ecole.scip.Stage.Solving:
+            n_open_nodes = scip.getNLeaves() + scip.getNChildren() + scip.getNSiblings()
+        else:
+            n_open_nodes = 0
+        stats[()] = (scip.getNNodes(),
+                     scip.getNLPIterations(),
+                     scip.getDepth(),
+                     scip.getGap(),
+                     scip.getPrimalbound(),
+                     scip.getDualbound(),
+                     n_open_nodes,
+                     scip.getSolvingTime())
+        return stats
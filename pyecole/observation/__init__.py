@@ -3,9 +3,11 @@ from .nothing import Nothing
 from .nodebipartite import NodeBipartite
 from .milpbipartite import MilpBipartite
 from .sbscore import StrongBranchingScores
-from .pseudocosts import Pseudocosts
+from .pseudocosts import Pseudocosts, PseudocostScoreHistory
 from .khalil import Khalil2016
-from .hutter import Hutter2011
+from .hutter import Hutter2011, Hutter2011Table
+from .featurematrix import FeatureMatrix
+from .normalizer import Normalize, RunningStatistics
 
 __all__ = ["ObservationFunction",
            "Nothing",
@@ -13,6 +15,11 @@ __all__ = ["ObservationFunction",
            "MilpBipartite",
            "StrongBranchingScores",
            "Pseudocosts",
+           "PseudocostScoreHistory",
            "Khalil2016",
            "Hutter2011",
+           "Hutter2011Table",
+           "FeatureMatrix",
+           "Normalize",
+           "RunningStatistics",
            ]
@@ -18,3 +18,29 @@ class coo_matrix:
     def nnz(self) -> int:
         raise NotImplementedError()
     
+
+class coo_array(coo_matrix):
+    """
+    Sparse matrix in coordinate format backed by NumPy arrays.
+    """
+    def __init__(self, indices: np.ndarray, values: np.ndarray,
+                 shape: List[int]) -> None:
+        self._indices = indices
+        self._values = values
+        self._shape = list(shape)
+
+    @property
+    def indices(self) -> np.ndarray:
+        return self._indices
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values
+
+    @property
+    def shape(self) -> List[int]:
+        return self._shape
+
+    @property
+    def nnz(self) -> int:
+        return len(self._values)
@@ -0,0 +1,171 @@
+import ecole.observation
+import numpy as np
+from ..scip import Model
+from ..typing import ObservationFunction
+from .nodebipartite import NodeBipartiteObs
+from .khalil import Khalil2016Obs
+from typing import Dict, List, Optional
+
+
+class FeatureMatrixObs:
+    """
+    Per-variable feature matrix fusing several observation functions.
+
+    The observation is a single contiguous matrix where rows represent all
+    variables and columns are the concatenation of the requested feature groups.
+    The layout of the columns is described by `columns` and `groups`.
+    """
+    def __init__(self, features: np.ndarray, columns: List[str],
+                 groups: Dict[str, slice]) -> None:
+        self._features = features
+        self._columns = columns
+        self._groups = groups
+
+    @property
+    def features(self) -> np.ndarray:
+        """
+        A matrix where each row represents a variable, and each column a feature
+        of the variable.
+
+        Variables are ordered according to their position in the original problem
+        (`SCIPvarGetProbindex`), hence they can be indexed by the `Branching`
+        environment `action_set`.
+        """
+        return self._features
+
+    @property
+    def columns(self) -> List[str]:
+        """
+        Name of every column of `features`, in the form `"<group>.<feature>"`.
+        """
+        return self._columns
+
+    @property
+    def groups(self) -> Dict[str, slice]:
+        """
+        Mapping from feature group name to the slice of columns it occupies.
+        """
+        return self._groups
+
+    def group(self, name: str) -> np.ndarray:
+        """
+        Return a view on the columns of the feature group `name`.
+        """
+        return self._features[:, self._groups[name]]
+
+
+class FeatureMatrix(ObservationFunction):
+    """
+    Fused per-variable feature matrix observation function.
+
+    This observation function extracts the requested feature groups among
+    `NodeBipartite` column features, `Khalil2016` features and `Pseudocosts`,
+    and writes them directly into one preallocated matrix, instead of
+    returning separate observations to be concatenated by the user.
+
+    This observation function extracts structured `FeatureMatrixObs`.
+    """
+    def __init__(self, node_bipartite: bool = True,
+                 khalil: bool = True,
+                 pseudocosts: bool = True,
+                 pseudo_candidates: bool = False,
+                 cache: bool = False,
+                 reuse_buffer: bool = False) -> None:
+        """
+        Constructor for `FeatureMatrix`.
+
+        Parameters
+        ----------
+        node_bipartite:
+            Whether to include the `NodeBipartite` column features.
+        khalil:
+            Whether to include the `Khalil2016` features.
+        pseudocosts:
+            Whether to include the `Pseudocosts` vector as a single column.
+        pseudo_candidates:
+            Whether the pseudo branching variable candidates or LP branching
+            variable candidates are observed by `Khalil2016`.
+        cache:
+            Whether or not `NodeBipartite` caches static features within an
+            episode. Currently, this is only safe if cutting planes are disabled.
+        reuse_buffer:
+            If true, the same matrix is overwritten at every extraction as long
+            as its shape does not change. Observations must then be consumed
+            (or copied) before the next state is extracted.
+        """
+        self.funcs = []
+        columns = []
+        groups = {}
+        if node_bipartite:
+            self.funcs.append(
+                ("node_bipartite", ecole.observation.NodeBipartite(cache),
+                 lambda data: data.variable_features)
+            )
+            columns.extend(f"node_bipartite.{feature.name}"
+                           for feature in NodeBipartiteObs.ColumnFeatures)
+        if khalil:
+            self.funcs.append(
+                ("khalil", ecole.observation.Khalil2016(pseudo_candidates),
+                 lambda data: data.features)
+            )
+            columns.extend(f"khalil.{feature.name}"
+                           for feature in Khalil2016Obs.Features)
+        if pseudocosts:
+            self.funcs.append(
+                ("pseudocosts", ecole.observation.Pseudocosts(),
+                 lambda data: data)
+            )
+            columns.append("pseudocosts.pseudocost")
+        if len(self.funcs) == 0:
+            raise ValueError("At least one feature group must be requested.")
+
+        start = 0
+        for name, _, _ in self.funcs:
+            prefix = f"{name}."
+            width = sum(column.startswith(prefix) for column in columns)
+            groups[name] = slice(start, start + width)
+            start += width
+        self.columns = columns
+        self.groups = groups
+        self.reuse_buffer = reuse_buffer
+        self._buffer = None
+
+    def before_reset(self, model: Model) -> None:
+        """
+        Reset the wrapped observation functions.
+        """
+        for _, func, _ in self.funcs:
+            func.before_reset(model.model)
+
+    def extract(self, model: Model, done: bool) -> Optional[FeatureMatrixObs]:
+        """
+        Extract all feature groups into a new `FeatureMatrixObs`.
+        """
+        blocks = []
+        for name, func, get_features in self.funcs:
+            data = func.extract(model.model, done)
+            if data is None:
+                return None
+            blocks.append((name, get_features(data)))
+
+        n_rows = blocks[0][1].shape[0]
+        for name, block in blocks:
+            if block.shape[0] != n_rows:
+                raise ValueError(
+                    f"Feature group '{name}' has {block.shape[0]} rows, "
+                    f"expected {n_rows}."
+                )
+
+        shape = (n_rows, len(self.columns))
+        if (self.reuse_buffer and self._buffer is not None
+                and self._buffer.shape == shape):
+            features = self._buffer
+        else:
+            features = np.empty(shape, dtype=np.float64)
+            if self.reuse_buffer:
+                self._buffer = features
+
+        for name, block in blocks:
+            target = features[:, self.groups[name]]
+            np.copyto(target, block.reshape(n_rows, -1))
+        return FeatureMatrixObs(features, self.columns, self.groups)
@@ -1,8 +1,11 @@
 import ecole.observation
+import json
+import os
 import numpy as np
+from ..parallel import instance_files, imap_instances
 from ..scip import Model
 from ..typing import ObservationFunction
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Union
 from enum import Enum
 
 class Hutter2011Obs:
@@ -87,4 +90,153 @@ class Hutter2011(ObservationFunction):
             return Hutter2011Obs(data)
         return data
 
-    
\ No newline at end of file
+    @staticmethod
+    def extract_batch(source: Union[os.PathLike, Iterable[os.PathLike]],
+                      directory: os.PathLike,
+                      n_jobs: Optional[int] = None,
+                      chunksize: int = 16,
+                      resume: bool = True) -> "Hutter2011Table":
+        """
+        Extract the features of a collection of instances in parallel.
+
+        Every instance is read and featurized in a pool of processes, and the 
+        features are written to a `Hutter2011Table` stored in `directory` as 
+        soon as they are computed. Failures are recorded per instance instead 
+        of aborting the collection.
+
+        Parameters
+        ----------
+        source:
+            A directory of instances, an instance file, or an iterable of 
+            instance files.
+        directory:
+            The directory where the table is stored.
+        n_jobs:
+            Number of worker processes. Defaults to the number of CPUs.
+        chunksize:
+            Number of instances sent to a worker at once.
+        resume:
+            If a table for the same instances already exists in `directory`, 
+            only featurize the instances that are still pending. Otherwise, 
+            start from an empty table.
+        """
+        paths = instance_files(source)
+        if resume and Hutter2011Table.exists(directory):
+            table = Hutter2011Table(directory, mode="r+")
+            if table.paths != paths:
+                raise ValueError(
+                    f"Table in '{directory}' was built for other instances."
+                )
+        else:
+            table = Hutter2011Table.create(directory, paths)
+
+        pending = np.flatnonzero(table.status == Hutter2011Table.PENDING)
+        results = imap_instances(_hutter2011_features,
+                                 [paths[i] for i in pending],
+                                 n_jobs=n_jobs, chunksize=chunksize)
+        for count, (i, features, error) in enumerate(results, 1):
+            table.record(int(pending[i]), features, error)
+            if count % chunksize == 0:
+                table.flush()
+        table.flush()
+        return table
+
+
+def _hutter2011_features(filepath: str) -> np.ndarray:
+    model = Model.from_file(filepath)
+    model.set_messagehdlr_quiet(True)
+    func = ecole.observation.Hutter2011()
+    func.before_reset(model.model)
+    data = func.extract(model.model, False)
+    if data is None:
+        raise RuntimeError(f"No features extracted from '{filepath}'.")
+    return np.asarray(data.features, dtype=np.float64)
+
+
+class Hutter2011Table:
+    """
+    Hutter2011 features of a collection of instances.
+
+    The table lives in a directory holding the list of instances 
+    (`instances.txt`), a memory-mapped feature matrix (`features.npy`) with one 
+    row per instance, a status vector (`status.npy`) and the errors raised by 
+    failed instances (`errors.jsonl`).
+    """
+    PENDING = 0
+    DONE = 1
+    FAILED = -1
+
+    def __init__(self, directory: os.PathLike, mode: str = "r") -> None:
+        """
+        Open an existing table.
+
+        Parameters
+        ----------
+        directory:
+            The directory where the table is stored.
+        mode:
+            Memory-mapping mode of the arrays, `"r"` for read-only or `"r+"` to 
+            update the table.
+        """
+        self.directory = directory
+        with open(os.path.join(directory, "instances.txt")) as file:
+            self.paths = file.read().splitlines()
+        self.features = np.load(os.path.join(directory, "features.npy"),
+                                mmap_mode=mode)
+        self.status = np.load(os.path.join(directory, "status.npy"),
+                              mmap_mode=mode)
+        self.errors = {}
+        errors_path = os.path.join(directory, "errors.jsonl")
+        if os.path.exists(errors_path):
+            with open(errors_path) as file:
+                for line in file:
+                    entry = json.loads(line)
+                    self.errors[entry["index"]] = entry["error"]
+
+    @staticmethod
+    def exists(directory: os.PathLike) -> bool:
+        return all(os.path.exists(os.path.join(directory, name))
+                   for name in ("instances.txt", "features.npy", "status.npy"))
+
+    @staticmethod
+    def create(directory: os.PathLike, paths: List[str]) -> "Hutter2011Table":
+        """
+        Create an empty table for the given instances, overwriting any table 
+        already stored in `directory`.
+        """
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, "instances.txt"), "w") as file:
+            file.write("".join(f"{path}\n" for path in paths))
+        features = np.lib.format.open_memmap(
+            os.path.join(directory, "features.npy"), mode="w+",
+            dtype=np.float64, shape=(len(paths), len(Hutter2011Obs.Features)))
+        features[:] = np.nan
+        features.flush()
+        np.save(os.path.join(directory, "status.npy"),
+                np.full(len(paths), Hutter2011Table.PENDING, dtype=np.int8))
+        errors_path = os.path.join(directory, "errors.jsonl")
+        if os.path.exists(errors_path):
+            os.remove(errors_path)
+        return Hutter2011Table(directory, mode="r+")
+
+    def record(self, index: int, features: Optional[np.ndarray],
+               error: Optional[str]) -> None:
+        """
+        Record the outcome of the featurization of instance `index`.
+        """
+        if error is None:
+            self.features[index] = features
+            self.status[index] = Hutter2011Table.DONE
+        else:
+            self.status[index] = Hutter2011Table.FAILED
+            self.errors[index] = error
+            with open(os.path.join(self.directory, "errors.jsonl"), "a") as file:
+                file.write(json.dumps({"index": index, "path": self.paths[index],
+                                       "error": error}) + "\n")
+
+    def flush(self) -> None:
+        """
+        Write pending changes of the memory-mapped arrays to disk.
+        """
+        self.features.flush()
+        self.status.flush()
@@ -1,11 +1,29 @@
 import ecole.observation
+import hashlib
+import os
 import numpy as np
+from ..cache import LRUCache
 from ..scip import Model
 from ..typing import ObservationFunction
-from .coo_matrix import coo_matrix
+from .coo_matrix import coo_matrix, coo_array
 from typing import Optional
 from enum import Enum
 
+# Parameters that do not change the presolved problem, excluded from the
+# memoization key. Random seeds are reset by the environment in every episode,
+# and only the permutation of the problem changes the presolved problem.
+_VOLATILE_PARAM_PREFIXES = ("randomization/", "limits/", "display/",
+                            "timing/", "visual/", "write/")
+_PERMUTATION_PARAMS = ("randomization/permuteconss", "randomization/permutevars")
+
+
+def _permutation(params) -> tuple:
+    """The parameters of the permutation of the problem, if enabled."""
+    flags = tuple(params[name] for name in _PERMUTATION_PARAMS)
+    if not any(flags):
+        return flags
+    return flags + (params["randomization/permutationseed"],)
+
 class MilpBipartiteObs:
     """
     Bipartite graph observation that represents the most recent MILP during 
@@ -67,6 +85,49 @@ class MilpBipartiteObs:
         return self.data.variable_features
 
 
+class _MilpBipartiteArrays:
+    """
+    Read-only copy of a `MilpBipartiteObs` data, held in NumPy arrays.
+    """
+    def __init__(self, edge_features: coo_matrix,
+                 constraint_features: np.ndarray,
+                 variable_features: np.ndarray) -> None:
+        self.edge_features = edge_features
+        self.constraint_features = constraint_features
+        self.variable_features = variable_features
+
+    @staticmethod
+    def from_data(data) -> "_MilpBipartiteArrays":
+        return _MilpBipartiteArrays.from_dict({
+            "edge_indices": data.edge_features.indices,
+            "edge_values": data.edge_features.values,
+            "edge_shape": data.edge_features.shape,
+            "constraint_features": data.constraint_features,
+            "variable_features": data.variable_features,
+        })
+
+    @staticmethod
+    def from_dict(arrays) -> "_MilpBipartiteArrays":
+        arrays = {name: np.array(value) for name, value in arrays.items()}
+        for value in arrays.values():
+            value.flags.writeable = False
+        return _MilpBipartiteArrays(
+            coo_array(arrays["edge_indices"], arrays["edge_values"],
+                      arrays["edge_shape"].tolist()),
+            arrays["constraint_features"],
+            arrays["variable_features"],
+        )
+
+    def to_dict(self):
+        return {
+            "edge_indices": self.edge_features.indices,
+            "edge_values": self.edge_features.values,
+            "edge_shape": np.array(self.edge_features.shape),
+            "constraint_features": self.constraint_features,
+            "variable_features": self.variable_features,
+        }
+
+
 class MilpBipartite(ObservationFunction):
     """
     Bipartite graph observation function for the sub-MILP at the latest 
@@ -74,7 +135,10 @@ class MilpBipartite(ObservationFunction):
 
     This observation function extracts structured `MilpBipartiteObs`.
     """
-    def __init__(self, normalize: bool = False) -> None:
+    def __init__(self, normalize: bool = False,
+                 memoize: bool = False,
+                 cache_size: int = 128,
+                 cache_dir: Optional[os.PathLike] = None) -> None:
         """
         Constructor for `MilpBipartite`.
 
@@ -83,21 +147,93 @@ class MilpBipartite(ObservationFunction):
         normalize:
             Should the features be normalized? This is recommended for some 
             applications such as deep learning models.
+        memoize:
+            Whether to memoize the first observation of every episode, keyed by 
+            the instance fingerprint, the solver parameters, and the stage of 
+            the solver when extracting. Episodes on an already seen instance 
+            then skip the extraction. Memoized observations are shared between 
+            episodes and hence read-only.
+            Random seeds are left out of the key, except the permutation seed 
+            when the problem is permuted, since it changes the presolved 
+            problem. As environments draw new seeds in every episode, and SCIP 
+            permutes constraints by default, the cache only hits across 
+            episodes when `randomization/permuteconss` and 
+            `randomization/permutevars` are disabled (e.g. with the 
+            `scip_params` of the environment).
+            The fingerprint is cached on the models of the environments, so 
+            that every instance file is only hashed once per process.
+        cache_size:
+            Maximum number of memoized observations kept in memory.
+        cache_dir:
+            If given, memoized observations are also stored in this directory 
+            and reloaded from it when evicted from memory (or in another 
+            process).
         """
         self.func = ecole.observation.MilpBipartite(normalize)
+        self.normalize = normalize
+        self.memoize = memoize
+        self.cache = LRUCache(cache_size)
+        self.cache_dir = cache_dir
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+        self._digest = None
+
+    def _instance_digest(self, model: Model):
+        fingerprint = model.fingerprint()
+        if fingerprint is None:
+            return None
+        digest = hashlib.sha256(fingerprint.encode())
+        params = model.get_params()
+        stable = sorted((name, value) for name, value in params.items()
+                        if not name.startswith(_VOLATILE_PARAM_PREFIXES))
+        digest.update(repr((self.normalize, stable, _permutation(params))).encode())
+        return digest
+
+    def _load(self, key: str) -> Optional[_MilpBipartiteArrays]:
+        arrays = self.cache.get(key)
+        if arrays is None and self.cache_dir is not None:
+            filepath = os.path.join(self.cache_dir, f"{key}.npz")
+            if os.path.exists(filepath):
+                with np.load(filepath) as stored:
+                    arrays = _MilpBipartiteArrays.from_dict(dict(stored))
+                self.cache.put(key, arrays)
+        return arrays
+
+    def _store(self, key: str, arrays: _MilpBipartiteArrays) -> None:
+        self.cache.put(key, arrays)
+        if self.cache_dir is not None:
+            filepath = os.path.join(self.cache_dir, f"{key}.npz")
+            np.savez(filepath, **arrays.to_dict())
 
     def before_reset(self, model: Model) -> None:
         """
-        Do nothing.
+        Hash the instance and parameters of the new episode, if memoizing.
         """
         self.func.before_reset(model.model)
+        self._digest = self._instance_digest(model) if self.memoize else None
 
     def extract(self, model: Model, done: bool) -> Optional[MilpBipartiteObs]:
         """
-        Extract a new `MilpBipartiteObs`.        
+        Extract a new `MilpBipartiteObs`.
+
+        When memoizing, the first extraction of an episode is looked up in the 
+        cache before being computed by SCIP.
         """
+        digest, self._digest = self._digest, None
+        key = None
+        if digest is not None:
+            # The stage is only known once the dynamics are reset
+            digest.update(repr(model.stage).encode())
+            key = digest.hexdigest()
+            arrays = self._load(key)
+            if arrays is not None:
+                return MilpBipartiteObs(arrays)
         data = self.func.extract(model.model, done)
-        if data is not None:
-            return MilpBipartiteObs(data)
-        return data
+        if data is None:
+            return data
+        if key is not None:
+            arrays = _MilpBipartiteArrays.from_data(data)
+            self._store(key, arrays)
+            return MilpBipartiteObs(arrays)
+        return MilpBipartiteObs(data)
     
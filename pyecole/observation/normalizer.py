@@ -0,0 +1,245 @@
+import copy
+import os
+import numpy as np
+from ..scip import Model
+from ..typing import ObservationFunction
+from typing import Dict, Optional, Sequence
+
+
+class RunningStatistics:
+    """
+    Streaming per-column mean and variance.
+
+    Statistics are accumulated with Welford's algorithm over batches of rows
+    and can be merged with statistics accumulated elsewhere (e.g. in another
+    worker) with the parallel formula of Chan et al. Non-finite entries are
+    ignored, so every column keeps its own count.
+    """
+    def __init__(self, n_features: Optional[int] = None) -> None:
+        """
+        Create empty statistics.
+
+        Parameters
+        ----------
+        n_features:
+            Number of columns. If not given, it is inferred from the first batch.
+        """
+        self.count = None
+        self.mean = None
+        self.m2 = None
+        if n_features is not None:
+            self._allocate(n_features)
+
+    def _allocate(self, n_features: int) -> None:
+        self.count = np.zeros(n_features, dtype=np.int64)
+        self.mean = np.zeros(n_features, dtype=np.float64)
+        self.m2 = np.zeros(n_features, dtype=np.float64)
+
+    def _combine(self, count: np.ndarray, mean: np.ndarray,
+                 m2: np.ndarray) -> None:
+        if self.count is None:
+            self._allocate(count.shape[0])
+        if count.shape != self.count.shape:
+            raise ValueError(
+                f"Expected {self.count.shape[0]} features, got {count.shape[0]}."
+            )
+        total = self.count + count
+        safe_total = np.maximum(total, 1)
+        delta = mean - self.mean
+        self.mean += delta * count / safe_total
+        self.m2 += m2 + delta ** 2 * self.count * count / safe_total
+        self.count = total
+
+    def update(self, batch: np.ndarray) -> None:
+        """
+        Accumulate a batch of rows.
+
+        Parameters
+        ----------
+        batch:
+            A matrix with one row per sample and one column per feature, or a
+            vector that is treated as a single column.
+        """
+        batch = np.asarray(batch, dtype=np.float64)
+        if batch.ndim == 1:
+            batch = batch[:, None]
+        finite = np.isfinite(batch)
+        count = finite.sum(axis=0)
+        values = np.where(finite, batch, 0.0)
+        mean = values.sum(axis=0) / np.maximum(count, 1)
+        m2 = (np.where(finite, batch - mean, 0.0) ** 2).sum(axis=0)
+        self._combine(count, mean, m2)
+
+    def merge(self, other: "RunningStatistics") -> "RunningStatistics":
+        """
+        Merge the statistics of `other` into these ones and return `self`.
+        """
+        if other.count is not None:
+            self._combine(other.count, other.mean, other.m2)
+        return self
+
+    @property
+    def var(self) -> np.ndarray:
+        """
+        Population variance of every column.
+        """
+        return self.m2 / np.maximum(self.count, 1)
+
+    @property
+    def std(self) -> np.ndarray:
+        """
+        Population standard deviation of every column.
+        """
+        return np.sqrt(self.var)
+
+    def state_dict(self) -> Dict[str, np.ndarray]:
+        """
+        Return the accumulated state as a dictionary of arrays.
+        """
+        if self.count is None:
+            return {}
+        return {"count": self.count.copy(),
+                "mean": self.mean.copy(),
+                "m2": self.m2.copy()}
+
+    def load_state_dict(self, state: Dict[str, np.ndarray]) -> None:
+        """
+        Restore a state returned by `state_dict`.
+        """
+        if len(state) == 0:
+            self.count = self.mean = self.m2 = None
+            return
+        self.count = np.array(state["count"], dtype=np.int64)
+        self.mean = np.array(state["mean"], dtype=np.float64)
+        self.m2 = np.array(state["m2"], dtype=np.float64)
+
+
+def _replace_field(observation, field: str, value: np.ndarray):
+    """Return a shallow copy of an observation with one matrix replaced."""
+    observation = copy.copy(observation)
+    target = observation
+    # Observation wrappers expose the matrices of their `data` as properties
+    if isinstance(getattr(type(observation), field, None), property):
+        observation.data = target = copy.copy(observation.data)
+    setattr(target, field, value)
+    return observation
+
+
+class Normalize(ObservationFunction):
+    """
+    Streaming normalization of matrix-valued observations.
+
+    This observation function wraps another observation function and
+    standardizes the columns of the requested feature matrices using running
+    statistics accumulated over all observations extracted so far (across
+    instances and episodes). Normalization is done in place, so the wrapped
+    observation is returned with its matrices modified, except for read-only
+    matrices (e.g. memoized `MilpBipartite` observations) which are normalized
+    into copies.
+    """
+    def __init__(self, function: ObservationFunction,
+                 fields: Optional[Sequence[str]] = None,
+                 update: bool = True,
+                 eps: float = 1e-8) -> None:
+        """
+        Constructor for `Normalize`.
+
+        Parameters
+        ----------
+        function:
+            The wrapped observation function.
+        fields:
+            Names of the matrix attributes of the observation to normalize, for
+            instance `("column_features", "row_features")` for `NodeBipartite`.
+            If not given, the observation itself must be an array (as returned
+            by `Pseudocosts`).
+        update:
+            Whether to keep updating the statistics with new observations.
+            Set to false to only apply previously loaded statistics.
+        eps:
+            Lower bound on the standard deviation used for scaling.
+        """
+        self.function = function
+        self.fields = tuple(fields) if fields is not None else None
+        self.update = update
+        self.eps = eps
+        keys = self.fields if self.fields is not None else ("observation",)
+        self.statistics = {key: RunningStatistics() for key in keys}
+
+    def before_reset(self, model: Model) -> None:
+        """
+        Reset the wrapped observation function.
+        """
+        self.function.before_reset(model)
+
+    def _normalize(self, key: str, matrix: np.ndarray) -> np.ndarray:
+        stats = self.statistics[key]
+        if self.update:
+            stats.update(matrix)
+        if stats.count is None:
+            return matrix
+        if not matrix.flags.writeable:
+            matrix = np.array(matrix, dtype=np.result_type(matrix, np.float64))
+        view = matrix[:, None] if matrix.ndim == 1 else matrix
+        view -= stats.mean
+        view /= np.maximum(stats.std, self.eps)
+        return matrix
+
+    def extract(self, model: Model, done: bool):
+        """
+        Extract the wrapped observation and normalize it in place.
+
+        Read-only matrices are normalized into copies, set on a shallow copy
+        of the observation, so that the wrapped observation is left intact.
+        """
+        observation = self.function.extract(model, done)
+        if observation is None:
+            return None
+        if self.fields is None:
+            return self._normalize("observation", observation)
+        for field in self.fields:
+            matrix = getattr(observation, field)
+            normalized = self._normalize(field, matrix)
+            if normalized is not matrix:
+                observation = _replace_field(observation, field, normalized)
+        return observation
+
+    def merge(self, other: "Normalize") -> "Normalize":
+        """
+        Merge the statistics accumulated by `other` (e.g. in another worker)
+        into these ones and return `self`.
+        """
+        for key, stats in self.statistics.items():
+            stats.merge(other.statistics[key])
+        return self
+
+    def state_dict(self) -> Dict[str, np.ndarray]:
+        """
+        Return the statistics of all fields as a flat dictionary of arrays.
+        """
+        return {f"{key}/{name}": value
+                for key, stats in self.statistics.items()
+                for name, value in stats.state_dict().items()}
+
+    def load_state_dict(self, state: Dict[str, np.ndarray]) -> None:
+        """
+        Restore statistics returned by `state_dict`.
+        """
+        for key, stats in self.statistics.items():
+            prefix = f"{key}/"
+            stats.load_state_dict({name[len(prefix):]: value
+                                   for name, value in state.items()
+                                   if name.startswith(prefix)})
+
+    def save(self, filepath: os.PathLike) -> None:
+        """
+        Save the statistics to a `.npz` file.
+        """
+        np.savez(filepath, **self.state_dict())
+
+    def load(self, filepath: os.PathLike) -> None:
+        """
+        Load statistics saved with `save`.
+        """
+        with np.load(filepath) as state:
+            self.load_state_dict(dict(state))
@@ -1,10 +1,75 @@
 import ecole.observation
 import numpy as np
+from ..buffer import RecordBuffer
 from ..scip import Model
 from ..typing import ObservationFunction
 from typing import Optional
 
 
+class PseudocostScoreHistory:
+    """
+    Array-backed history of the changes of pseudocost scores within an episode.
+
+    Every time a variable's pseudocost score (the product of its up and down 
+    pseudocosts extracted by `Pseudocosts`) differs from the one extracted at 
+    the previous state, a record `(step, node, variable, score, delta)` is 
+    added, where `step` counts the extractions of the episode, `node` is the 
+    number of the current branch-and-bound node, and `delta` is the change of 
+    the score since the previous record of the variable (`NaN` for its first 
+    record). Scores are compared between states, so the individual updates of 
+    the up and down pseudocosts, which PySCIPOpt does not expose, are not 
+    recorded. All fields are returned as NumPy views, in order of insertion.
+    """
+    dtype = np.dtype([("step", np.int64),
+                      ("node", np.int64),
+                      ("variable", np.int64),
+                      ("score", np.float64),
+                      ("delta", np.float64)])
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self.buffer = RecordBuffer(PseudocostScoreHistory.dtype, capacity)
+
+    def __len__(self) -> int:
+        return len(self.buffer)
+
+    @property
+    def records(self) -> np.ndarray:
+        """
+        A structured array with all the records.
+        """
+        return self.buffer.view()
+
+    @property
+    def step(self) -> np.ndarray:
+        return self.buffer["step"]
+
+    @property
+    def node(self) -> np.ndarray:
+        return self.buffer["node"]
+
+    @property
+    def variable(self) -> np.ndarray:
+        return self.buffer["variable"]
+
+    @property
+    def score(self) -> np.ndarray:
+        return self.buffer["score"]
+
+    @property
+    def delta(self) -> np.ndarray:
+        return self.buffer["delta"]
+
+    def of_variable(self, index: int) -> np.ndarray:
+        """
+        Return the records of the variable at position `index` in the problem.
+        """
+        records = self.buffer.view()
+        return records[records["variable"] == index]
+
+    def clear(self) -> None:
+        self.buffer.clear()
+
+
 class Pseudocosts(ObservationFunction):
     """
     Pseudocosts observation function on branch-and-bound nodes.
@@ -23,18 +88,58 @@ class Pseudocosts(ObservationFunction):
     the `Branching` environment `action_set`. Variables for which a pseudocost 
     is not applicable are filled with `NaN`.
     """
-    def __init__(self) -> None:
+    def __init__(self, history: bool = False) -> None:
+        """
+        Constructor for `Pseudocosts`.
+
+        Parameters
+        ----------
+        history:
+            Whether to record the changes of the pseudocost scores of the 
+            episode in a `PseudocostScoreHistory`, available as the `history` 
+            attribute.
+        """
         self.func = ecole.observation.Pseudocosts()
+        self.history = PseudocostScoreHistory() if history else None
+        self._last = None
+        self._step = 0
 
     def before_reset(self, model: Model) -> None:
         """
-        Do nothing.
+        Clear the pseudocost score history, if any.
         """
         self.func.before_reset(model.model)
+        if self.history is not None:
+            self.history.clear()
+        self._last = None
+        self._step = 0
+
+    def _record(self, model: Model, scores: np.ndarray) -> None:
+        current = np.asarray(scores, dtype=np.float64)
+        last = self._last
+        if last is None or last.shape != current.shape:
+            last = np.full(current.shape, np.nan)
+        known = np.isfinite(current)
+        changed = np.flatnonzero(known & ~(current == last))
+        if len(changed) > 0:
+            node = model.as_pyscipopt().getCurrentNode()
+            self.history.buffer.extend(
+                step=self._step,
+                node=node.getNumber() if node is not None else -1,
+                variable=changed,
+                score=current[changed],
+                delta=current[changed] - last[changed],
+            )
+        # Variables leaving the candidate set keep their last score.
+        self._last = np.where(known, current, last)
+        self._step += 1
 
     def extract(self, model: Model, done: bool) -> Optional[np.ndarray]:
         """        
         Extract an array containing pseudocosts.
         """
-        return self.func.extract(model.model, done)
+        pseudocosts = self.func.extract(model.model, done)
+        if self.history is not None and pseudocosts is not None:
+            self._record(model, pseudocosts)
+        return pseudocosts
 
@@ -0,0 +1,101 @@
+"""Utilities to process collections of instances in a pool of processes."""
+
+import multiprocessing
+import os
+import traceback
+from typing import *
+
+# File extensions of the problem formats read by SCIP.
+INSTANCE_EXTENSIONS = (".mps", ".lp", ".cip", ".opb", ".wbo", ".pip",
+                       ".zpl", ".fzn", ".osil", ".rlp", ".cnf", ".sto",
+                       ".cor", ".tim")
+
+
+def _is_instance_file(filename: str) -> bool:
+    if filename.endswith(".gz"):
+        filename = filename[:-len(".gz")]
+    return filename.endswith(INSTANCE_EXTENSIONS)
+
+
+def instance_files(source: Union[os.PathLike, Iterable[os.PathLike]]
+                   ) -> List[str]:
+    """
+    List the instance files of a source.
+
+    Parameters
+    ----------
+    source:
+        Either a directory, which is searched recursively for files with a
+        problem format readable by SCIP, a single instance file, or an iterable
+        (e.g. a list or a generator) of instance files.
+
+    Returns
+    -------
+    paths:
+        The instance files, sorted when read from a directory, in the order
+        of the iterable otherwise.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        source = os.fspath(source)
+        if not os.path.isdir(source):
+            return [source]
+        paths = []
+        for root, _, filenames in os.walk(source):
+            paths.extend(os.path.join(root, filename)
+                         for filename in filenames
+                         if _is_instance_file(filename))
+        return sorted(paths)
+    return [os.fspath(path) for path in source]
+
+
+class _Captured:
+    """Picklable wrapper returning the outcome of a function call."""
+
+    def __init__(self, func: Callable) -> None:
+        self.func = func
+
+    def __call__(self, indexed_item):
+        index, item = indexed_item
+        try:
+            return index, self.func(item), None
+        except Exception:
+            return index, None, traceback.format_exc()
+
+
+def imap_instances(func: Callable[[Any], Any],
+                   items: Iterable[Any],
+                   n_jobs: Optional[int] = None,
+                   chunksize: int = 1
+                   ) -> Iterator[Tuple[int, Any, Optional[str]]]:
+    """
+    Apply `func` to every item in a pool of processes.
+
+    Exceptions raised by `func` are captured so that one failing instance does
+    not abort the whole collection.
+
+    Parameters
+    ----------
+    func:
+        A picklable function (e.g. defined at the top level of a module).
+    items:
+        The items to process, typically instance files.
+    n_jobs:
+        Number of worker processes. Defaults to the number of CPUs. If 1, items
+        are processed sequentially in the current process.
+    chunksize:
+        Number of items sent to a worker at once.
+
+    Returns
+    -------
+    results:
+        An iterator, in order of completion, over tuples
+        `(index, result, error)` where `index` is the position of the item,
+        and exactly one of `result` and `error` (the formatted traceback) is
+        not None.
+    """
+    captured = _Captured(func)
+    if n_jobs == 1:
+        yield from map(captured, enumerate(items))
+        return
+    with multiprocessing.Pool(n_jobs) as pool:
+        yield from pool.imap_unordered(captured, enumerate(items), chunksize)
@@ -6,6 +6,12 @@ from .solvingtime import SolvingTime
 from .pdintegrals import (PrimalIntegral,
                           DualIntegral,
                           PrimalDualIntegral)
+from .bounds import BoundStore
+from .timeline import (BoundTimeline,
+                       BoundRecorder,
+                       primal_integral,
+                       dual_integral,
+                       primal_dual_integral)
 
 __all__ = ["RewardFunction",
            "IsDone",
@@ -15,5 +21,11 @@ __all__ = ["RewardFunction",
            "PrimalIntegral",
            "DualIntegral",
            "PrimalDualIntegral",
+           "BoundStore",
+           "BoundTimeline",
+           "BoundRecorder",
+           "primal_integral",
+           "dual_integral",
+           "primal_dual_integral",
            ]
 
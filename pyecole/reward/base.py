@@ -1,11 +1,62 @@
 import ecole.typing
+import functools
 import math
+import operator
+import numpy as np
 from ..scip import Model
 from ..typing import RewardFunction
+from typing import *
+
+
+def _unwrap(other):
+    """Pass the Ecole function wrapped by `other`, if any, to Ecole."""
+    if isinstance(other, BaseRewardFunction):
+        return other.data
+    return other
+
+
+def _round(value, ndigits):
+    return round(value, ndigits)
+
+
+def _log(value, base):
+    return np.log(value) / np.log(base)
+
+
+class _CumulativeSum:
+    """Stateful operation returning the sum of its operand across extractions."""
+
+    def __init__(self) -> None:
+        self.total = 0.0
+
+    def reset(self) -> None:
+        self.total = 0.0
+
+    def __call__(self, value):
+        self.total += value
+        return self.total
+
 
 class BaseRewardFunction(RewardFunction):
-    def __init__(self, data: ecole.typing.RewardFunction) -> None:
+    """
+    Reward function wrapping an Ecole reward function.
+
+    Arithmetic on reward functions builds new reward functions. Besides the 
+    composed Ecole function, every composed reward function records the 
+    operation `op` applied to its operands `args` (reward functions or 
+    constants), so that expressions can be inspected and compiled, see 
+    `pyecole.data.ExtractionGraph`. Leaf reward functions have no `op`.
+    """
+    def __init__(self, data: ecole.typing.RewardFunction,
+                 op: Optional[Callable] = None,
+                 args: Tuple = ()) -> None:
         self.data = data
+        self.op = op
+        self.args = args
+
+    def _compose(self, data: ecole.typing.RewardFunction, op: Callable,
+                 *args) -> RewardFunction:
+        return BaseRewardFunction(data, op, args)
 
     def before_reset(self, model: Model) -> None:
         self.data.before_reset(model.model)
@@ -14,185 +65,215 @@ class BaseRewardFunction(RewardFunction):
         return self.data.extract(model.model, done)
     
     def __add__(self, other) -> RewardFunction:
-        return BaseRewardFunction(self.data.__add__(other))
+        return self._compose(self.data.__add__(_unwrap(other)),
+                             operator.add, self, other)
 
     def __sub__(self, other) -> RewardFunction:
-        return BaseRewardFunction(self.data.__sub__(other))
+        return self._compose(self.data.__sub__(_unwrap(other)),
+                             operator.sub, self, other)
 
     def __mul__(self, other) -> RewardFunction:
-        return BaseRewardFunction(self.data.__mul__(other))
+        return self._compose(self.data.__mul__(_unwrap(other)),
+                             operator.mul, self, other)
 
     def __matmul__(self, other) -> RewardFunction:
-        return BaseRewardFunction(self.data.__matmul__(other))
+        return self._compose(self.data.__matmul__(_unwrap(other)),
+                             operator.matmul, self, other)
 
     def __truediv__(self, other) -> RewardFunction:
-        return BaseRewardFunction(self.data.__truediv__(other))
+        return self._compose(self.data.__truediv__(_unwrap(other)),
+                             operator.truediv, self, other)
 
     def __floordiv__(self, other) -> RewardFunction:
-        return BaseRewardFunction(self.data.__floordiv__(other))
+        return self._compose(self.data.__floordiv__(_unwrap(other)),
+                             operator.floordiv, self, other)
 
     def __mod__(self, other) -> RewardFunction:
-        return BaseRewardFunction(self.data.__mod__(other))
+        return self._compose(self.data.__mod__(_unwrap(other)),
+                             operator.mod, self, other)
 
     def __divmod__(self, other) -> RewardFunction:
-        return BaseRewardFunction(self.data.__divmod__(other))
+        return self._compose(self.data.__divmod__(_unwrap(other)),
+                             divmod, self, other)
 
     def __pow__(self, other) -> RewardFunction:
-        return BaseRewardFunction(self.data.__pow__(other))
+        return self._compose(self.data.__pow__(_unwrap(other)),
+                             operator.pow, self, other)
 
     def __lshift__(self, other) -> RewardFunction:
-        return BaseRewardFunction(self.data.__lshift__(other))
+        return self._compose(self.data.__lshift__(_unwrap(other)),
+                             operator.lshift, self, other)
 
     def __rshift__(self, other) -> RewardFunction:
-        return BaseRewardFunction(self.data.__rshift__(other))
+        return self._compose(self.data.__rshift__(_unwrap(other)),
+                             operator.rshift, self, other)
 
     def __and__(self, other) -> RewardFunction:
-        return BaseRewardFunction(self.data.__and__(other))
+        return self._compose(self.data.__and__(_unwrap(other)),
+                             operator.and_, self, other)
 
     def __xor__(self, other) -> RewardFunction:
-        return BaseRewardFunction(self.data.__xor__(other))
+        return self._compose(self.data.__xor__(_unwrap(other)),
+                             operator.xor, self, other)
 
     def __or__(self, other) -> RewardFunction:
-        return BaseRewardFunction(self.data.__or__(other))
+        return self._compose(self.data.__or__(_unwrap(other)),
+                             operator.or_, self, other)
 
     def __radd__(self, other) -> RewardFunction:
-        return BaseRewardFunction(self.data.__radd__(other))
+        return self._compose(self.data.__radd__(_unwrap(other)),
+                             operator.add, other, self)
 
     def __rsub__(self, other) -> RewardFunction:
-        return BaseRewardFunction(self.data.__rsub__(other))
+        return self._compose(self.data.__rsub__(_unwrap(other)),
+                             operator.sub, other, self)
 
     def __rmul__(self, other) -> RewardFunction:
-        return BaseRewardFunction(self.data.__rmul__(other))
+        return self._compose(self.data.__rmul__(_unwrap(other)),
+                             operator.mul, other, self)
 
     def __rmatmul__(self, other) -> RewardFunction:
-        return BaseRewardFunction(self.data.__rmatmul__(other))
+        return self._compose(self.data.__rmatmul__(_unwrap(other)),
+                             operator.matmul, other, self)
 
     def __rtruediv__(self, other) -> RewardFunction:
-        return BaseRewardFunction(self.data.__rtruediv__(other))
+        return self._compose(self.data.__rtruediv__(_unwrap(other)),
+                             operator.truediv, other, self)
 
     def __rfloordiv__(self, other) -> RewardFunction:
-        return BaseRewardFunction(self.data.__rfloordiv__(other))
+        return self._compose(self.data.__rfloordiv__(_unwrap(other)),
+                             operator.floordiv, other, self)
 
     def __rmod__(self, other) -> RewardFunction:
-        return BaseRewardFunction(self.data.__rmod__(other))
+        return self._compose(self.data.__rmod__(_unwrap(other)),
+                             operator.mod, other, self)
 
     def __rdivmod__(self, other) -> RewardFunction:
-        return BaseRewardFunction(self.data.__rdivmod__(other))
+        return self._compose(self.data.__rdivmod__(_unwrap(other)),
+                             divmod, other, self)
 
     def __rpow__(self, other) -> RewardFunction:
-        return BaseRewardFunction(self.data.__rpow__(other))
+        return self._compose(self.data.__rpow__(_unwrap(other)),
+                             operator.pow, other, self)
 
     def __rlshift__(self, other) -> RewardFunction:
-        return BaseRewardFunction(self.data.__rlshift__(other))
+        return self._compose(self.data.__rlshift__(_unwrap(other)),
+                             operator.lshift, other, self)
 
     def __rrshift__(self, other) -> RewardFunction:
-        return BaseRewardFunction(self.data.__rrshift__(other))
+        return self._compose(self.data.__rrshift__(_unwrap(other)),
+                             operator.rshift, other, self)
 
     def __rand__(self, other) -> RewardFunction:
-        return BaseRewardFunction(self.data.__rand__(other))
+        return self._compose(self.data.__rand__(_unwrap(other)),
+                             operator.and_, other, self)
 
     def __rxor__(self, other) -> RewardFunction:
-        return BaseRewardFunction(self.data.__rxor__(other))
+        return self._compose(self.data.__rxor__(_unwrap(other)),
+                             operator.xor, other, self)
 
     def __ror__(self, other) -> RewardFunction:
-        return BaseRewardFunction(self.data.__ror__(other))
+        return self._compose(self.data.__ror__(_unwrap(other)),
+                             operator.or_, other, self)
 
     def __neg__(self) -> RewardFunction:
-        return BaseRewardFunction(self.data.__neg__())
+        return self._compose(self.data.__neg__(), operator.neg, self)
 
     def __pos__(self) -> RewardFunction:
-        return BaseRewardFunction(self.data.__pos__())
+        return self._compose(self.data.__pos__(), operator.pos, self)
 
     def __abs__(self) -> RewardFunction:
-        return BaseRewardFunction(self.data.__abs__())
+        return self._compose(self.data.__abs__(), operator.abs, self)
 
     def __invert__(self) -> RewardFunction:
-        return BaseRewardFunction(self.data.__invert__())
+        return self._compose(self.data.__invert__(), operator.invert, self)
 
     def __int__(self) -> RewardFunction:
-        return BaseRewardFunction(self.data.__int__())
+        return self._compose(self.data.__int__(), int, self)
 
     def __float__(self) -> RewardFunction:
-        return BaseRewardFunction(self.data.__float__())
+        return self._compose(self.data.__float__(), float, self)
 
     def __complex__(self) -> RewardFunction:
-        return BaseRewardFunction(self.data.__complex__())
+        return self._compose(self.data.__complex__(), complex, self)
 
     def __round__(self, ndigits=0) -> RewardFunction:
-        return BaseRewardFunction(self.data.__round__(ndigits))
+        return self._compose(self.data.__round__(ndigits),
+                             functools.partial(_round, ndigits=ndigits), self)
 
     def __trunc__(self) -> RewardFunction:
-        return BaseRewardFunction(self.data.__trunc__())
+        return self._compose(self.data.__trunc__(), math.trunc, self)
 
     def __floor__(self) -> RewardFunction:
-        return BaseRewardFunction(self.data.__floor__())
+        return self._compose(self.data.__floor__(), math.floor, self)
 
     def __ceil__(self) -> RewardFunction:
-        return BaseRewardFunction(self.data.__ceil__())
+        return self._compose(self.data.__ceil__(), math.ceil, self)
 
     def exp(self) -> RewardFunction:
-        return BaseRewardFunction(self.data.exp())
+        return self._compose(self.data.exp(), np.exp, self)
 
     def log(self, base=math.e) -> RewardFunction:
-        return BaseRewardFunction(self.data.log(base))
+        return self._compose(self.data.log(base),
+                             functools.partial(_log, base=base), self)
 
     def log2(self) -> RewardFunction:
-        return BaseRewardFunction(self.data.log2())
+        return self._compose(self.data.log2(), np.log2, self)
 
     def log10(self) -> RewardFunction:
-        return BaseRewardFunction(self.data.log10())
+        return self._compose(self.data.log10(), np.log10, self)
 
     def sqrt(self) -> RewardFunction:
-        return BaseRewardFunction(self.data.sqrt())
+        return self._compose(self.data.sqrt(), np.sqrt, self)
 
     def sin(self) -> RewardFunction:
-        return BaseRewardFunction(self.data.sin())
+        return self._compose(self.data.sin(), np.sin, self)
 
     def cos(self) -> RewardFunction:
-        return BaseRewardFunction(self.data.cos())
+        return self._compose(self.data.cos(), np.cos, self)
 
     def tan(self) -> RewardFunction:
-        return BaseRewardFunction(self.data.tan())
+        return self._compose(self.data.tan(), np.tan, self)
 
     def asin(self) -> RewardFunction:
-        return BaseRewardFunction(self.data.asin())
+        return self._compose(self.data.asin(), np.arcsin, self)
 
     def acos(self) -> RewardFunction:
-        return BaseRewardFunction(self.data.acos())
+        return self._compose(self.data.acos(), np.arccos, self)
 
     def atan(self) -> RewardFunction:
-        return BaseRewardFunction(self.data.atan())
+        return self._compose(self.data.atan(), np.arctan, self)
 
     def sinh(self) -> RewardFunction:
-        return BaseRewardFunction(self.data.sinh())
+        return self._compose(self.data.sinh(), np.sinh, self)
 
     def cosh(self) -> RewardFunction:
-        return BaseRewardFunction(self.data.cosh())
+        return self._compose(self.data.cosh(), np.cosh, self)
 
     def tanh(self) -> RewardFunction:
-        return BaseRewardFunction(self.data.tanh())
+        return self._compose(self.data.tanh(), np.tanh, self)
 
     def asinh(self) -> RewardFunction:
-        return BaseRewardFunction(self.data.asinh())
+        return self._compose(self.data.asinh(), np.arcsinh, self)
 
     def acosh(self) -> RewardFunction:
-        return BaseRewardFunction(self.data.acosh())
+        return self._compose(self.data.acosh(), np.arccosh, self)
 
     def atanh(self) -> RewardFunction:
-        return BaseRewardFunction(self.data.atanh())
+        return self._compose(self.data.atanh(), np.arctanh, self)
 
     def isfinite(self) -> RewardFunction:
-        return BaseRewardFunction(self.data.isfinite())
+        return self._compose(self.data.isfinite(), np.isfinite, self)
 
     def isinf(self) -> RewardFunction:
-        return BaseRewardFunction(self.data.isinf())
+        return self._compose(self.data.isinf(), np.isinf, self)
 
     def isnan(self) -> RewardFunction:
-        return BaseRewardFunction(self.data.isnan())
+        return self._compose(self.data.isnan(), np.isnan, self)
     
     def apply(self, func) -> RewardFunction:
-        return BaseRewardFunction(self.data.apply(func))
+        return self._compose(self.data.apply(func), func, self)
     
     def cumsum(self) -> RewardFunction:
-        return BaseRewardFunction(self.data.cumsum())
+        return self._compose(self.data.cumsum(), _CumulativeSum(), self)
 
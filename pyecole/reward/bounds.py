@@ -0,0 +1,158 @@
+import os
+import warnings
+from ..parallel import instance_files, imap_instances
+from ..scip import Model
+from ..store import KeyValueStore
+from typing import *
+
+
+def _solve_for_bounds(task) -> Tuple[str, Dict[str, Any]]:
+    filepath, time_limit, scip_params = task
+    model = Model.from_file(filepath)
+    key = model.fingerprint()
+    if key is None:
+        raise ValueError(f"Cannot fingerprint '{filepath}'.")
+    model.set_messagehdlr_quiet(True)
+    model.set_params(scip_params)
+    if time_limit is not None:
+        model.set_param("limits/time", time_limit)
+    model.solve()
+    scip = model.as_pyscipopt()
+    return key, {"path": filepath,
+                 "maximize": scip.getObjectiveSense() == "maximize",
+                 "primal_bound": model.primal_bound,
+                 "dual_bound": model.dual_bound,
+                 "status": scip.getStatus(),
+                 "solving_time": scip.getSolvingTime()}
+
+
+class BoundStore:
+    """
+    Persistent store of the best known bounds of instances.
+
+    Bounds are keyed by the fingerprint of the instance, so that they can be
+    looked up from any copy of the problem, whatever its file path. The store
+    provides ready-made `bound_function` arguments for `PrimalIntegral` and
+    `DualIntegral`.
+    """
+    def __init__(self, filepath: os.PathLike) -> None:
+        """
+        Open (or create) the store.
+
+        Parameters
+        ----------
+        filepath:
+            Path of the database file.
+        """
+        self.store = KeyValueStore(filepath)
+
+    def get(self, model: Model) -> Optional[Dict[str, Any]]:
+        """
+        Return the entry of the instance of `model`, if labelled.
+
+        Entries are dictionaries with the `path` of the labelled file, the
+        objective sense `maximize`, the best `primal_bound` and `dual_bound`,
+        and the `status` and `solving_time` of the solve that produced them.
+        """
+        key = model.fingerprint()
+        if key is None:
+            return None
+        return self.store.get(key)
+
+    def _merge(self, key: str, entry: Dict[str, Any]) -> None:
+        previous = self.store.get(key)
+        if previous is not None:
+            better = max if entry["maximize"] else min
+            worse = min if entry["maximize"] else max
+            entry["primal_bound"] = better(entry["primal_bound"],
+                                           previous["primal_bound"])
+            entry["dual_bound"] = worse(entry["dual_bound"],
+                                        previous["dual_bound"])
+        self.store.put(key, entry)
+        self.store.put(f"path:{os.path.abspath(entry['path'])}", key)
+
+    def label(self, source: Union[os.PathLike, Iterable[os.PathLike]],
+              time_limit: Optional[float] = None,
+              scip_params: Optional[Dict[str, Union[bool, int, float, str]]] = None,
+              n_jobs: Optional[int] = None,
+              overwrite: bool = False) -> Dict[int, str]:
+        """
+        Solve a collection of instances in parallel and store their bounds.
+
+        Bounds found for an instance already in the store are merged with the
+        stored ones, keeping the best of both.
+
+        Parameters
+        ----------
+        source:
+            A directory of instances, an instance file, or an iterable of
+            instance files.
+        time_limit:
+            Time limit in seconds of every solve.
+        scip_params:
+            Parameters set on every model before solving.
+        n_jobs:
+            Number of worker processes. Defaults to the number of CPUs.
+        overwrite:
+            Whether to solve again the files that were already labelled.
+
+        Returns
+        -------
+        errors:
+            The traceback of the error raised for every failed instance, keyed
+            by its position in the source.
+        """
+        paths = instance_files(source)
+        if not overwrite:
+            paths = [path for path in paths
+                     if f"path:{os.path.abspath(path)}" not in self.store]
+        scip_params = scip_params if scip_params is not None else {}
+        tasks = [(path, time_limit, scip_params) for path in paths]
+        errors = {}
+        for index, result, error in imap_instances(_solve_for_bounds, tasks,
+                                                    n_jobs=n_jobs):
+            if error is None:
+                self._merge(*result)
+            else:
+                errors[index] = error
+        return errors
+
+    def bound_function(self, kind: str = "primal", strict: bool = False
+                       ) -> Callable[[Model], Tuple[float, float]]:
+        """
+        Return a `bound_function` using the stored bounds as offset.
+
+        The lookup uses the fingerprint cached on the model, so instances are
+        only hashed once when their models come from a `ModelCache` or are
+        read from files by an environment.
+
+        Parameters
+        ----------
+        kind:
+            `"primal"` for `PrimalIntegral` or `"dual"` for `DualIntegral`. In
+            both cases the offset is the best known primal bound (the optimal
+            value for instances solved to optimality), and the initial bound is
+            the Ecole default.
+        strict:
+            If true, instances missing from the store raise a `KeyError`.
+            Otherwise they get a zero offset, with a warning.
+        """
+        if kind not in ("primal", "dual"):
+            raise ValueError(f"Unknown bound function kind '{kind}'.")
+
+        def bound_function(model: Model) -> Tuple[float, float]:
+            entry = self.get(model)
+            if entry is None:
+                message = f"Instance '{model.name}' is not in the bound store."
+                if strict:
+                    raise KeyError(message)
+                warnings.warn(f"{message} Using a zero offset.")
+            maximize = model.as_pyscipopt().getObjectiveSense() == "maximize"
+            if (kind == "primal") != maximize:
+                initial_bound = 1e20
+            else:
+                initial_bound = -1e20
+            offset = entry["primal_bound"] if entry is not None else 0.0
+            return offset, initial_bound
+
+        return bound_function
@@ -3,6 +3,32 @@ from ..scip import Model
 from .base import BaseRewardFunction
 from typing import *
 
+
+class _BoundFunction:
+    """
+    Adapt a bound function on `Model` to the Ecole model passed by Ecole.
+
+    The `Model` last given to `before_reset` is passed instead of a new wrapper
+    when it wraps the Ecole model, so that data cached on it, such as its
+    fingerprint, is reused.
+    """
+    def __init__(self, bound_function: Callable[[Model], Tuple[float, float]]) -> None:
+        self.bound_function = bound_function
+        self.model = None
+
+    def __call__(self, model) -> Tuple[float, float]:
+        if self.model is not None and self.model.model is model:
+            return self.bound_function(self.model)
+        return self.bound_function(Model(model))
+
+
+def _wrap_bound_function(bound_function: Optional[Callable[[Model], Tuple[float, float]]]
+                         ) -> Optional[_BoundFunction]:
+    """Adapt a bound function on `Model` to the Ecole model passed by Ecole."""
+    if bound_function is None:
+        return None
+    return _BoundFunction(bound_function)
+
 class PrimalIntegral(BaseRewardFunction):
     """
     Primal integral difference.
@@ -30,13 +56,19 @@ class PrimalIntegral(BaseRewardFunction):
             The default function returns `(0, -1e20)` if the problem is a 
             maximization and `(0, 1e20)` otherwise.
         """
-        func = lambda model: bound_function(model.model)
-        super().__init__(ecole.reward.PrimalIntegral(wall, func))
+        func = _wrap_bound_function(bound_function)
+        if func is None:
+            super().__init__(ecole.reward.PrimalIntegral(wall))
+        else:
+            super().__init__(ecole.reward.PrimalIntegral(wall, func))
+        self.bound_function = func
 
     def before_reset(self, model: Model) -> None:
         """
         Reset the internal clock counter and the event handler.
         """
+        if self.bound_function is not None:
+            self.bound_function.model = model
         self.data.before_reset(model.model)
 
     def extract(self, model: Model, done: bool = False) -> float:
@@ -75,13 +107,19 @@ class DualIntegral(BaseRewardFunction):
             default function returns `(0, 1e20)` if the problem is a maximization 
             and `(0, -1e20)` otherwise.
         """
-        func = lambda model: bound_function(model.model)
-        super().__init__(ecole.reward.DualIntegral(wall, func))
+        func = _wrap_bound_function(bound_function)
+        if func is None:
+            super().__init__(ecole.reward.DualIntegral(wall))
+        else:
+            super().__init__(ecole.reward.DualIntegral(wall, func))
+        self.bound_function = func
 
     def before_reset(self, model: Model) -> None:
         """
         Reset the internal clock counter and the event handler.
         """
+        if self.bound_function is not None:
+            self.bound_function.model = model
         self.data.before_reset(model.model)
 
     def extract(self, model: Model, done: bool = False) -> float:
@@ -119,13 +157,19 @@ class PrimalDualIntegral(BaseRewardFunction):
             returns `(-1e20, 1e20)` if the problem is a maximization and 
             `(1e20, -1e20)` otherwise.
         """
-        func = lambda model: bound_function(model.model)
-        super().__init__(ecole.reward.PrimalDualIntegral(wall, func))
+        func = _wrap_bound_function(bound_function)
+        if func is None:
+            super().__init__(ecole.reward.PrimalDualIntegral(wall))
+        else:
+            super().__init__(ecole.reward.PrimalDualIntegral(wall, func))
+        self.bound_function = func
 
     def before_reset(self, model: Model) -> None:
         """
         Reset the internal clock counter and the event handler.
         """
+        if self.bound_function is not None:
+            self.bound_function.model = model
         self.data.before_reset(model.model)
 
     def extract(self, model: Model, done: bool = False) -> float:
@@ -0,0 +1,288 @@
+import ecole.scip
+import functools
+import os
+import time
+import numpy as np
+from ..buffer import RecordBuffer
+from ..scip import Model
+from ..typing import InformationFunction
+from typing import Optional
+
+
+class BoundTimeline:
+    """
+    Timeline of the primal and dual bounds of an episode.
+
+    Each record holds the wall time, the process time, and the primal and dual
+    bounds at one point of the episode, and whether it was taken at a state of
+    the environment (as opposed to during a transition). The first record is
+    taken when the episode starts, before the problem is transformed, and
+    therefore has `NaN` bounds. Records are stored in a `RecordBuffer` and
+    exposed as NumPy views.
+    """
+    dtype = np.dtype([("wall_time", np.float64),
+                      ("process_time", np.float64),
+                      ("primal_bound", np.float64),
+                      ("dual_bound", np.float64),
+                      ("state", np.bool_)])
+
+    def __init__(self, maximize: bool = False, capacity: int = 1024) -> None:
+        self.maximize = maximize
+        self.buffer = RecordBuffer(BoundTimeline.dtype, capacity)
+
+    def __len__(self) -> int:
+        return len(self.buffer)
+
+    def append(self, primal_bound: float, dual_bound: float,
+               state: bool = True) -> None:
+        """
+        Record the given bounds at the current wall and process times.
+        """
+        self.buffer.append(time.perf_counter(), time.process_time(),
+                           primal_bound, dual_bound, state)
+
+    @property
+    def records(self) -> np.ndarray:
+        return self.buffer.view()
+
+    def times(self, wall: bool = False) -> np.ndarray:
+        """
+        Time of every record in seconds since the start of the episode.
+        """
+        clock = self.buffer["wall_time" if wall else "process_time"]
+        return clock - clock[0]
+
+    @property
+    def primal_bound(self) -> np.ndarray:
+        return self.buffer["primal_bound"]
+
+    @property
+    def dual_bound(self) -> np.ndarray:
+        return self.buffer["dual_bound"]
+
+    @property
+    def state(self) -> np.ndarray:
+        return self.buffer["state"]
+
+    def save(self, filepath: os.PathLike) -> None:
+        """
+        Save the timeline to a `.npz` file.
+        """
+        np.savez(filepath, records=self.records, maximize=self.maximize)
+
+    @staticmethod
+    def load(filepath: os.PathLike) -> "BoundTimeline":
+        """
+        Load a timeline saved with `save`.
+        """
+        with np.load(filepath) as stored:
+            records = stored["records"]
+            timeline = BoundTimeline(bool(stored["maximize"]), len(records))
+        columns = {name: records[name] for name in records.dtype.names}
+        # Timelines saved before bound changes were recorded only hold states
+        columns.setdefault("state", np.ones(len(records), dtype=np.bool_))
+        timeline.buffer.extend(**columns)
+        return timeline
+
+
+@functools.lru_cache(maxsize=None)
+def _bound_event_handler_type() -> type:
+    """The PySCIPOpt event handler class recording bound changes, imported lazily."""
+    from pyscipopt import Eventhdlr, SCIP_EVENTTYPE
+
+    # The primal bound changes with new incumbents, and the dual bound when LPs
+    # and nodes are solved
+    events = (SCIP_EVENTTYPE.BESTSOLFOUND | SCIP_EVENTTYPE.LPSOLVED
+              | SCIP_EVENTTYPE.NODESOLVED)
+
+    class BoundEventHandler(Eventhdlr):
+        """Append the bounds to a timeline every time they change while solving."""
+
+        def __init__(self, timeline: BoundTimeline) -> None:
+            self.timeline = timeline
+            self.bounds = None
+
+        def eventinit(self) -> None:
+            self.model.catchEvent(events, self)
+
+        def eventexit(self) -> None:
+            self.model.dropEvent(events, self)
+
+        def eventexec(self, event) -> dict:
+            bounds = (self.model.getPrimalbound(), self.model.getDualbound())
+            if bounds != self.bounds:
+                self.bounds = bounds
+                self.timeline.append(*bounds, state=False)
+            return {}
+
+    return BoundEventHandler
+
+
+class BoundRecorder(InformationFunction):
+    """
+    Recorder of the primal and dual bounds along an episode.
+
+    The recorder adds a record to a new `BoundTimeline` at the start of every
+    episode and then at every extraction, *i.e.* at every state of the
+    environment. In between, a PySCIPOpt event handler attached to the model
+    records the bounds every time a new incumbent is found or an LP or a node
+    is solved, like the event handlers of Ecole's integral rewards, so that a
+    single transition solving the whole instance (as in `Configuring`) is
+    recorded with all its bound changes. Primal, dual, and primal-dual
+    integrals with any offset, initial bounds, or clock can then be computed
+    afterwards from the saved timelines with `primal_integral`,
+    `dual_integral`, and `primal_dual_integral`, instead of re-solving the
+    instances.
+
+    The extracted information is the timeline of the current episode.
+    """
+    def __init__(self) -> None:
+        self.timeline = None
+        self.scip = None
+
+    def before_reset(self, model: Model) -> None:
+        """
+        Start a new timeline and attach the event handler to the model.
+        """
+        # The handler only holds a weak reference to the PySCIPOpt model
+        self.scip = model.as_pyscipopt()
+        maximize = self.scip.getObjectiveSense() == "maximize"
+        self.timeline = BoundTimeline(maximize)
+        self.timeline.append(np.nan, np.nan)
+        handler = _bound_event_handler_type()(self.timeline)
+        self.scip.includeEventhdlr(handler, f"pyecole_bounds_{id(self)}",
+                                   "Records the primal and dual bounds")
+
+    def extract(self, model: Model, done: bool) -> BoundTimeline:
+        """
+        Record the current bounds and return the timeline.
+        """
+        if model.stage in (ecole.scip.Stage.Init, ecole.scip.Stage.Problem):
+            self.timeline.append(np.nan, np.nan)
+        else:
+            self.timeline.append(model.primal_bound, model.dual_bound)
+        return self.timeline
+
+
+def _integral(timeline: BoundTimeline, values: np.ndarray, wall: bool,
+              per_step: bool) -> np.ndarray:
+    # A bound is assumed to hold from its record until the next one.
+    times = timeline.times(wall)
+    cumulative = np.concatenate(([0.0], np.cumsum(values[:-1] * np.diff(times))))
+    if per_step:
+        return np.diff(cumulative[timeline.state])
+    return cumulative[-1]
+
+
+def _primal(timeline: BoundTimeline, initial_primal_bound: float) -> np.ndarray:
+    bound = np.where(np.isnan(timeline.primal_bound), initial_primal_bound,
+                     timeline.primal_bound)
+    if timeline.maximize:
+        return np.maximum(bound, initial_primal_bound)
+    return np.minimum(bound, initial_primal_bound)
+
+
+def _dual(timeline: BoundTimeline, initial_dual_bound: float) -> np.ndarray:
+    bound = np.where(np.isnan(timeline.dual_bound), initial_dual_bound,
+                     timeline.dual_bound)
+    if timeline.maximize:
+        return np.minimum(bound, initial_dual_bound)
+    return np.maximum(bound, initial_dual_bound)
+
+
+def primal_integral(timeline: BoundTimeline, offset: float = 0.0,
+                    initial_primal_bound: Optional[float] = None,
+                    wall: bool = False, per_step: bool = False):
+    """
+    Compute the primal integral of a recorded episode.
+
+    Parameters
+    ----------
+    timeline:
+        The timeline recorded by a `BoundRecorder`.
+    offset:
+        The value to compute the primal bound with respect to, typically the
+        optimal or best known objective value.
+    initial_primal_bound:
+        The primal bound used before the first solution is found. Defaults to
+        `-1e20` for maximization problems and `1e20` otherwise.
+    wall:
+        If true, the wall time is used. If false (default), the process time is
+        used.
+    per_step:
+        If true, return the integral between every two consecutive states
+        instead of the total. The first value corresponds to the reward offset
+        of `reset`, and the following ones to the rewards of every `step`.
+    """
+    if initial_primal_bound is None:
+        initial_primal_bound = -1e20 if timeline.maximize else 1e20
+    gap = _primal(timeline, initial_primal_bound) - offset
+    if timeline.maximize:
+        gap = -gap
+    return _integral(timeline, gap, wall, per_step)
+
+
+def dual_integral(timeline: BoundTimeline, offset: float = 0.0,
+                  initial_dual_bound: Optional[float] = None,
+                  wall: bool = False, per_step: bool = False):
+    """
+    Compute the dual integral of a recorded episode.
+
+    Parameters
+    ----------
+    timeline:
+        The timeline recorded by a `BoundRecorder`.
+    offset:
+        The value to compute the dual bound with respect to, typically the
+        optimal or best known objective value.
+    initial_dual_bound:
+        The dual bound used before the first one is computed. Defaults to
+        `1e20` for maximization problems and `-1e20` otherwise.
+    wall:
+        If true, the wall time is used. If false (default), the process time is
+        used.
+    per_step:
+        If true, return the integral between every two consecutive states
+        instead of the total.
+    """
+    if initial_dual_bound is None:
+        initial_dual_bound = 1e20 if timeline.maximize else -1e20
+    gap = offset - _dual(timeline, initial_dual_bound)
+    if timeline.maximize:
+        gap = -gap
+    return _integral(timeline, gap, wall, per_step)
+
+
+def primal_dual_integral(timeline: BoundTimeline,
+                         initial_primal_bound: Optional[float] = None,
+                         initial_dual_bound: Optional[float] = None,
+                         wall: bool = False, per_step: bool = False):
+    """
+    Compute the primal-dual integral of a recorded episode.
+
+    Parameters
+    ----------
+    timeline:
+        The timeline recorded by a `BoundRecorder`.
+    initial_primal_bound:
+        The primal bound used before the first solution is found. Defaults to
+        `-1e20` for maximization problems and `1e20` otherwise.
+    initial_dual_bound:
+        The dual bound used before the first one is computed. Defaults to
+        `1e20` for maximization problems and `-1e20` otherwise.
+    wall:
+        If true, the wall time is used. If false (default), the process time is
+        used.
+    per_step:
+        If true, return the integral between every two consecutive states
+        instead of the total.
+    """
+    if initial_primal_bound is None:
+        initial_primal_bound = -1e20 if timeline.maximize else 1e20
+    if initial_dual_bound is None:
+        initial_dual_bound = 1e20 if timeline.maximize else -1e20
+    gap = (_primal(timeline, initial_primal_bound)
+           - _dual(timeline, initial_dual_bound))
+    if timeline.maximize:
+        gap = -gap
+    return _integral(timeline, gap, wall, per_step)
@@ -1,4 +1,10 @@
 from .model import Model
+from .binary import convert_instances
+from .shared import SharedModel
+from .modelcache import ModelCache
 
-__all__ = ["Model"]
-
+__all__ = ["Model",
+           "ModelCache",
+           "SharedModel",
+           "convert_instances",
+           ]
@@ -0,0 +1,198 @@
+"""Binary container of the arrays of linear problems."""
+
+import json
+import os
+import numpy as np
+from typing import *
+
+# File extension of the binary container format.
+BINARY_EXTENSION = ".milp"
+
+_MAGIC = b"PYECOLE\x01"
+# Arrays are aligned in the file so that they can be memory-mapped efficiently.
+_ALIGNMENT = 64
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def _encode_names(names: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    encoded = [name.encode() for name in names]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(name) for name in encoded])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _decode_names(blob: np.ndarray, offsets: np.ndarray) -> List[str]:
+    blob = bytes(blob)
+    return [blob[start:end].decode() for start, end in zip(offsets[:-1], offsets[1:])]
+
+
+def _layout(arrays: Dict[str, np.ndarray], metadata: Optional[Dict[str, Any]]
+            ) -> Tuple[bytes, Dict[str, int], int]:
+    """Encode the header and compute the position of every array and the total size."""
+    header = {"metadata": metadata if metadata is not None else {}, "arrays": {}}
+    # Offsets are relative to the end of the header, whose length depends on them
+    offset = 0
+    for name, array in arrays.items():
+        offset = _aligned(offset)
+        header["arrays"][name] = {"dtype": array.dtype.str, "shape": array.shape,
+                                  "offset": offset}
+        offset += array.nbytes
+    encoded = json.dumps(header).encode()
+    start = _aligned(len(_MAGIC) + 8 + len(encoded))
+    positions = {name: start + spec["offset"] for name, spec in header["arrays"].items()}
+    return encoded, positions, start + offset
+
+
+def pack_arrays(arrays: Dict[str, np.ndarray], metadata: Optional[Dict[str, Any]],
+                allocate: Callable[[int], Any]) -> Any:
+    """
+    Lay out arrays in a buffer with the same format as the binary container.
+
+    The buffer starts with a magic string and the length of a JSON header describing
+    the dtype, shape, and offset of every array, followed by the raw data of
+    the arrays.
+
+    Parameters
+    ----------
+    arrays:
+        The arrays to pack.
+    metadata:
+        JSON serializable data stored in the header.
+    allocate:
+        A callable returning a writable buffer of the given number of bytes,
+        e.g. a `bytearray` or the buffer of a shared memory block.
+
+    Returns
+    -------
+    buffer:
+        The buffer returned by `allocate`.
+    """
+    arrays = {name: np.asarray(array, order="C") for name, array in arrays.items()}
+    encoded, positions, size = _layout(arrays, metadata)
+    buffer = allocate(size)
+    view = np.frombuffer(buffer, dtype=np.uint8, count=size)
+    view[:len(_MAGIC)] = np.frombuffer(_MAGIC, dtype=np.uint8)
+    view[len(_MAGIC):len(_MAGIC) + 8] = np.frombuffer(np.uint64(len(encoded)).tobytes(),
+                                                      dtype=np.uint8)
+    view[len(_MAGIC) + 8:len(_MAGIC) + 8 + len(encoded)] = np.frombuffer(encoded,
+                                                                       dtype=np.uint8)
+    for name, array in arrays.items():
+        view[positions[name]:positions[name] + array.nbytes] = array.reshape(-1).view(np.uint8)
+    return buffer
+
+
+def unpack_arrays(buffer: Any) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """
+    Return views of the arrays, and the metadata, of a buffer in the container format.
+
+    The arrays share the memory of the buffer.
+    """
+    raw = np.frombuffer(buffer, dtype=np.uint8)
+    if raw[:len(_MAGIC)].tobytes() != _MAGIC:
+        raise ValueError("Not a binary container buffer.")
+    length = int(raw[len(_MAGIC):len(_MAGIC) + 8].view(np.uint64)[0])
+    header = json.loads(raw[len(_MAGIC) + 8:len(_MAGIC) + 8 + length].tobytes().decode())
+    start = _aligned(len(_MAGIC) + 8 + length)
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype, shape = np.dtype(spec["dtype"]), tuple(spec["shape"])
+        arrays[name] = np.frombuffer(raw, dtype=dtype, count=int(np.prod(shape)),
+                                     offset=start + spec["offset"]).reshape(shape)
+    return arrays, header["metadata"]
+
+
+def write_arrays(filepath: os.PathLike, arrays: Dict[str, np.ndarray],
+                 metadata: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Write arrays to a binary container file (see `pack_arrays`).
+    """
+    buffer = pack_arrays(arrays, metadata, bytearray)
+    # Written next to the destination and moved, so that no partial file is ever visible
+    temporary = f"{os.fspath(filepath)}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(buffer)
+    os.replace(temporary, filepath)
+
+
+def read_arrays(filepath: os.PathLike, mmap: bool = False
+                ) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """
+    Read the arrays and metadata of a binary container file.
+
+    Parameters
+    ----------
+    filepath:
+        Path of the container.
+    mmap:
+        If true, arrays are read-only memory maps of the file instead of
+        being read into memory.
+    """
+    if mmap:
+        return unpack_arrays(np.memmap(filepath, dtype=np.uint8, mode="r"))
+    with open(filepath, "rb") as file:
+        return unpack_arrays(file.read())
+
+
+def _convert(task) -> str:
+    from .model import Model
+
+    filepath, output = task
+    Model.from_file(filepath).write_binary(output)
+    return output
+
+
+def convert_instances(source: Union[os.PathLike, Iterable[os.PathLike]],
+                      directory: os.PathLike,
+                      n_jobs: Optional[int] = None,
+                      overwrite: bool = False) -> Dict[int, str]:
+    """
+    Convert a collection of instances to the binary container format in parallel.
+
+    The converted files give access to the arrays of the problems without
+    SCIP (see `Model.read_binary_arrays`), not faster loading of models.
+
+    Every instance is written to `directory` under its path relative to the
+    source directory (or its file name for other sources), with the binary
+    extension instead of its own.
+
+    Parameters
+    ----------
+    source:
+        A directory of instances, an instance file, or an iterable of
+        instance files.
+    directory:
+        The output directory.
+    n_jobs:
+        Number of worker processes. Defaults to the number of CPUs.
+    overwrite:
+        Whether to convert again the instances that already have an output.
+
+    Returns
+    -------
+    errors:
+        The traceback of the error raised for every failed instance, keyed
+        by its position in the source.
+    """
+    from ..parallel import instance_files, imap_instances
+
+    paths = instance_files(source)
+    if isinstance(source, (str, os.PathLike)) and os.path.isdir(source):
+        names = [os.path.relpath(path, source) for path in paths]
+    else:
+        names = [os.path.basename(path) for path in paths]
+    tasks = []
+    for path, name in zip(paths, names):
+        if name.endswith(".gz"):
+            name = name[:-len(".gz")]
+        output = os.path.join(directory, os.path.splitext(name)[0] + BINARY_EXTENSION)
+        if overwrite or not os.path.exists(output):
+            os.makedirs(os.path.dirname(output), exist_ok=True)
+            tasks.append((path, output))
+    errors = {}
+    for index, _, error in imap_instances(_convert, tasks, n_jobs=n_jobs):
+        if error is not None:
+            errors[paths.index(tasks[index][0])] = error
+    return errors
@@ -1,17 +1,260 @@
 import os
+import functools
+import hashlib
 import ecole.scip
+import numpy as np
+from .binary import (write_arrays, read_arrays, pack_arrays, unpack_arrays,
+                     _encode_names, _decode_names)
 from typing import *
 
+_VTYPE_CODES = {"BINARY": 0, "INTEGER": 1, "IMPLINT": 2, "CONTINUOUS": 3}
+# PySCIPOpt variable types, indexed by code.
+_VTYPE_NAMES = ("B", "I", "M", "C")
+
+
+def _problem_arrays(model: ecole.scip.Model, transformed: bool = False,
+                    lp_rows: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Read the linear problem data of `model` into NumPy arrays.
+
+    Variables are read in the order of ``SCIPgetOrigVars`` (or ``SCIPgetVars``
+    for the transformed problem). Constraints are read in the order of
+    ``SCIPgetConss``, where only linear constraints are supported, or, with
+    `lp_rows`, as the rows of the current LP relaxation in the order of
+    ``SCIPgetLPRows``, whatever the constraints they come from.
+    """
+    scip = model.as_pyscipopt()
+    variables = scip.getVars(transformed=transformed)
+    if lp_rows:
+        indptr, indices, data, row_lb, row_ub = _lp_rows(scip, variables)
+    else:
+        indptr, indices, data, row_lb, row_ub = _linear_constraints(scip, variables)
+
+    if transformed:
+        var_lb = [var.getLbGlobal() for var in variables]
+        var_ub = [var.getUbGlobal() for var in variables]
+        # The transformed problem is always a minimization problem
+        maximize = False
+    else:
+        var_lb = [var.getLbOriginal() for var in variables]
+        var_ub = [var.getUbOriginal() for var in variables]
+        maximize = scip.getObjectiveSense() == "maximize"
+    return {
+        "indptr": indptr,
+        "indices": np.array(indices, dtype=np.int64),
+        "data": np.array(data, dtype=np.float64),
+        "row_lb": np.array(row_lb, dtype=np.float64),
+        "row_ub": np.array(row_ub, dtype=np.float64),
+        "c": np.array([var.getObj() for var in variables], dtype=np.float64),
+        "var_lb": np.array(var_lb, dtype=np.float64),
+        "var_ub": np.array(var_ub, dtype=np.float64),
+        "vtypes": np.array([_VTYPE_CODES[var.vtype()] for var in variables],
+                           dtype=np.int8),
+        "maximize": np.array(maximize),
+    }
+
+
+def _linear_constraints(scip, variables) -> Tuple[np.ndarray, list, list, list, list]:
+    """CSR matrix and sides of the linear constraints of the problem."""
+    # Coefficients of linear constraints are only exposed by variable name
+    position = {var.name: i for i, var in enumerate(variables)}
+    if len(position) != len(variables):
+        raise ValueError("Variable names are not unique.")
+    conss = scip.getConss()
+    indptr = np.zeros(len(conss) + 1, dtype=np.int64)
+    indices, data, row_lb, row_ub = [], [], [], []
+    for i, cons in enumerate(conss):
+        if not cons.isLinear():
+            raise ValueError(f"Constraint '{cons.name}' is not linear.")
+        coefs = scip.getValsLinear(cons)
+        indices.extend(map(position.__getitem__, coefs))
+        data.extend(coefs.values())
+        indptr[i + 1] = len(indices)
+        row_lb.append(scip.getLhs(cons))
+        row_ub.append(scip.getRhs(cons))
+    return indptr, indices, data, row_lb, row_ub
+
+
+def _lp_rows(scip, variables) -> Tuple[np.ndarray, list, list, list, list]:
+    """CSR matrix and sides of the rows of the current LP relaxation."""
+    # Columns are mapped to variables by pointer, which is unique unlike names
+    position = {var.ptr(): i for i, var in enumerate(variables)}
+    rows = scip.getLPRowsData()
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    indices, data, row_lb, row_ub = [], [], [], []
+    for i, row in enumerate(rows):
+        indices.extend(position[col.getVar().ptr()] for col in row.getCols())
+        data.extend(row.getVals())
+        indptr[i + 1] = len(indices)
+        # Rows are lhs <= a x + constant <= rhs
+        constant = row.getConstant()
+        lhs, rhs = row.getLhs(), row.getRhs()
+        row_lb.append(lhs if scip.isInfinity(-lhs) else lhs - constant)
+        row_ub.append(rhs if scip.isInfinity(rhs) else rhs - constant)
+    return indptr, indices, data, row_lb, row_ub
+
+
+def _float_bits(values: np.ndarray) -> np.ndarray:
+    # Adding zero maps -0.0 to 0.0, so that equal values have equal bits.
+    return (np.asarray(values, dtype=np.float64) + 0.0).view(np.uint64)
+
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    """Vectorized 64 bits integer hash (splitmix64 finalizer), wrapping on overflow."""
+    values = np.asarray(values, dtype=np.uint64).copy()
+    values ^= values >> np.uint64(30)
+    values *= np.uint64(0xbf58476d1ce4e5b9)
+    values ^= values >> np.uint64(27)
+    values *= np.uint64(0x94d049bb133111eb)
+    values ^= values >> np.uint64(31)
+    return values
+
+
+def _canonical_codes(arrays: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hash every variable and constraint from its own data and that of its neighbours.
+
+    Codes do not depend on the order of variables, constraints, and coefficients, so sorting
+    them gives a representation invariant to permutations of the problem.
+    """
+    var_codes = _mix(_mix(_mix(_mix(_float_bits(arrays["c"]))
+                               ^ _float_bits(arrays["var_lb"]))
+                          ^ _float_bits(arrays["var_ub"]))
+                     ^ arrays["vtypes"].astype(np.uint64))
+    indptr, indices = arrays["indptr"], arrays["indices"]
+    coef_codes = _mix(_float_bits(arrays["data"]))
+    rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+
+    row_sums = np.zeros(len(indptr) - 1, dtype=np.uint64)
+    np.add.at(row_sums, rows, _mix(var_codes[indices] ^ coef_codes))
+    row_codes = _mix(_mix(_mix(_float_bits(arrays["row_lb"])) ^ _float_bits(arrays["row_ub"]))
+                     + row_sums)
+
+    var_sums = np.zeros(len(var_codes), dtype=np.uint64)
+    np.add.at(var_sums, indices, _mix(row_codes[rows] ^ coef_codes))
+    var_codes = _mix(var_codes + var_sums)
+    return np.sort(var_codes), np.sort(row_codes)
+
+
+def _hash_arrays(arrays: Dict[str, np.ndarray]) -> str:
+    digest = hashlib.sha256()
+    for name in sorted(arrays):
+        digest.update(name.encode())
+        digest.update(np.ascontiguousarray(arrays[name]).tobytes())
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _default_params() -> Dict[str, Union[bool, int, float, str]]:
+    return ecole.scip.Model.prob_basic().get_params()
+
+
 class Model:
     def __init__(self, model: ecole.scip.Model) -> None:
         self.model = model
+        self.fingerprints = {}
 
     def as_pyscipopt(self) -> object:
         return self.model.as_pyscipopt()
     
     def copy_orig(self) -> "Model":
-        return Model(self.model.copy_orig())
+        copy = Model(self.model.copy_orig())
+        copy.fingerprints = dict(self.fingerprints)
+        return copy
+
+    def fingerprint(self, canonical: bool = False) -> Optional[str]:
+        """
+        Hash the original problem data, independently of file paths and names.
+
+        The hash covers the constraint matrix, row bounds, objective, variable
+        bounds and types, and the objective sense, all read into NumPy arrays
+        and hashed at once with SHA-256, so it is stable across processes.
+        It is cached on the model (and its copies), including when the problem
+        cannot be hashed, and can only be computed before the problem is
+        transformed. The cache is not invalidated when the problem is modified
+        (e.g. through :py:meth:`as_pyscipopt`): clear `fingerprints` after
+        modifying a problem whose fingerprint was computed.
+
+        The hashing is vectorized, but PySCIPOpt has no bulk access to the
+        problem data, so reading it is a Python loop over the constraints
+        which dominates the cost: with a million nonzeros, reading takes well
+        over half a second, about ten times longer than hashing.
+
+        Parameters
+        ----------
+        canonical:
+            If true, the hash does not depend on the order of the variables,
+            constraints, and coefficients. Every variable and constraint is
+            hashed from its own data and that of its neighbours in the
+            constraint matrix, and the sorted codes are hashed.
+
+        Returns
+        -------
+        fingerprint:
+            The hexadecimal digest, or None if the problem is transformed,
+            has non-linear constraints, or has variables with the same name.
+        """
+        if canonical not in self.fingerprints:
+            if self.stage != ecole.scip.Stage.Problem:
+                return None
+            try:
+                arrays = self.to_arrays()
+            except ValueError:
+                # Non-linear problems, or duplicate variable names, are not read again
+                self.fingerprints[canonical] = None
+                return None
+            if canonical:
+                var_codes, row_codes = _canonical_codes(arrays)
+                arrays = {"variables": var_codes, "constraints": row_codes,
+                          "maximize": arrays["maximize"]}
+            self.fingerprints[canonical] = _hash_arrays(arrays)
+        return self.fingerprints[canonical]
     
+    def to_arrays(self, transformed: bool = False) -> Dict[str, np.ndarray]:
+        """
+        Return the problem data as NumPy arrays.
+
+        Parameters
+        ----------
+        transformed:
+            If false (default), read the original problem, which is only
+            possible before the problem is transformed. If true, read the
+            transformed problem, with the global variable bounds and the
+            objective minimized by SCIP. While solving, the constraints are
+            then the rows of the current LP relaxation (including the cuts
+            added so far), whatever the type of the constraints they come
+            from, such as the set partitioning, logicor, knapsack, and
+            variable bound constraints created by presolving. Before, only
+            linear constraints can be read.
+
+        Returns
+        -------
+        arrays:
+            A dictionary with the constraint matrix in CSR format (`indptr`,
+            `indices`, and `data`), the row bounds `row_lb` and `row_ub`, the
+            objective `c`, the variable bounds `var_lb` and `var_ub`, the
+            variable types `vtypes` (0 for binary, 1 for integer, 2 for implicit
+            integer, and 3 for continuous), and the objective sense `maximize`.
+            Infinite bounds are given as SCIP infinity (``1e20`` by default).
+
+        Raises
+        ------
+        ValueError:
+            If the requested problem is not available in the current stage,
+            has constraints that cannot be read (see `transformed`), or has
+            variables with the same name, since the coefficients of linear
+            constraints are only exposed by variable name.
+        """
+        stage = self.stage
+        if transformed and stage in (ecole.scip.Stage.Init, ecole.scip.Stage.Problem):
+            raise ValueError("The problem is not transformed.")
+        if not transformed and stage != ecole.scip.Stage.Problem:
+            raise ValueError("The original problem is only available before it is transformed.")
+        # PySCIPOpt does not expose the data of the specialized constraints created by
+        # presolving, but their LP relaxations are plain rows
+        lp_rows = transformed and stage == ecole.scip.Stage.Solving
+        return _problem_arrays(self.model, transformed, lp_rows)
+
     def disable_cuts(self) -> None:
         self.model.disable_cuts()
 
@@ -50,6 +293,174 @@ class Model:
     def prob_basic(name: str = "Model") -> "Model":
         return Model(ecole.scip.Model.prob_basic(name))
     
+    @staticmethod
+    def from_arrays(matrix: Union[Tuple[np.ndarray, np.ndarray, np.ndarray], Any],
+                    row_lb: np.ndarray, row_ub: np.ndarray, c: np.ndarray,
+                    var_lb: np.ndarray, var_ub: np.ndarray, vtypes: np.ndarray,
+                    maximize: bool = False, name: str = "Model",
+                    var_names: Optional[Sequence[str]] = None,
+                    cons_names: Optional[Sequence[str]] = None) -> "Model":
+        """
+        Create a model from the arrays of a linear problem.
+
+        This is the inverse of :py:meth:`to_arrays`: the variables and the
+        linear constraints are created in the order of the arrays.
+
+        Parameters
+        ----------
+        matrix:
+            The constraint matrix in CSR format, either as a tuple
+            `(indptr, indices, data)`, or as an object with these attributes
+            (e.g. a `scipy.sparse.csr_matrix`). Duplicate entries are summed.
+        row_lb, row_ub:
+            The bounds of the constraints. Use +/- ``1e20`` (or infinity) for
+            no bound.
+        c:
+            The objective coefficients.
+        var_lb, var_ub:
+            The bounds of the variables.
+        vtypes:
+            The variable types as in :py:meth:`to_arrays` (0 for binary, 1 for
+            integer, 2 for implicit integer, and 3 for continuous).
+        maximize:
+            Whether the objective is maximized.
+        name:
+            The name of the problem.
+        var_names, cons_names:
+            The names of the variables and constraints. Defaults to `x0`,
+            `x1`, ... and `c0`, `c1`, ...
+        """
+        from pyscipopt.scip import Expr, ExprCons, Term
+
+        if isinstance(matrix, tuple):
+            indptr, indices, data = matrix
+        else:
+            indptr, indices, data = matrix.indptr, matrix.indices, matrix.data
+        indptr = np.asarray(indptr, dtype=np.int64)
+        indices = np.asarray(indices, dtype=np.int64)
+        data = np.asarray(data, dtype=np.float64)
+        n_rows, n_vars = len(indptr) - 1, len(c)
+
+        # Sum duplicate entries, which would otherwise overwrite each other in an expression
+        rows = np.repeat(np.arange(n_rows), np.diff(indptr))
+        entries, inverse = np.unique(rows * n_vars + indices, return_inverse=True)
+        if len(entries) < len(indices):
+            data = np.bincount(inverse, weights=data, minlength=len(entries))
+            rows, indices = np.divmod(entries, n_vars)
+            indptr = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=n_rows))))
+
+        model = Model.prob_basic(name)
+        scip = model.as_pyscipopt()
+        if maximize:
+            scip.setMaximize()
+        infinity = scip.infinity()
+        var_lb = np.maximum(np.asarray(var_lb, dtype=np.float64), -infinity).tolist()
+        var_ub = np.minimum(np.asarray(var_ub, dtype=np.float64), infinity).tolist()
+        row_lb = np.maximum(np.asarray(row_lb, dtype=np.float64), -infinity).tolist()
+        row_ub = np.minimum(np.asarray(row_ub, dtype=np.float64), infinity).tolist()
+        if var_names is None:
+            var_names = [f"x{j}" for j in range(n_vars)]
+        if cons_names is None:
+            cons_names = [f"c{i}" for i in range(n_rows)]
+        terms = [Term(scip.addVar(var_name, _VTYPE_NAMES[vtype], lb, ub, obj))
+                 for var_name, vtype, lb, ub, obj in zip(var_names,
+                                                         np.asarray(vtypes).tolist(),
+                                                         var_lb, var_ub,
+                                                         np.asarray(c).tolist())]
+        # Expressions are built from dictionaries of terms, bypassing operator overloading
+        indptr, indices, data = indptr.tolist(), indices.tolist(), data.tolist()
+        for i in range(n_rows):
+            start, end = indptr[i], indptr[i + 1]
+            expr = Expr(dict(zip([terms[j] for j in indices[start:end]], data[start:end])))
+            scip.addCons(ExprCons(expr, row_lb[i], row_ub[i]), name=cons_names[i])
+        return model
+
+    def _export(self) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        """Arrays and metadata of the original problem, including names."""
+        arrays = self.to_arrays()
+        scip = self.as_pyscipopt()
+        arrays["var_names"], arrays["var_name_offsets"] = _encode_names(
+            [var.name for var in scip.getVars()]
+        )
+        arrays["cons_names"], arrays["cons_name_offsets"] = _encode_names(
+            [cons.name for cons in scip.getConss()]
+        )
+        return arrays, {"name": self.name}
+
+    @staticmethod
+    def _import(arrays: Dict[str, np.ndarray], metadata: Dict[str, Any]) -> "Model":
+        """Create a model from the output of `_export`."""
+        return Model.from_arrays(
+            (arrays["indptr"], arrays["indices"], arrays["data"]),
+            arrays["row_lb"], arrays["row_ub"], arrays["c"],
+            arrays["var_lb"], arrays["var_ub"], arrays["vtypes"],
+            maximize=bool(arrays["maximize"]), name=metadata["name"],
+            var_names=_decode_names(arrays["var_names"], arrays["var_name_offsets"]),
+            cons_names=_decode_names(arrays["cons_names"], arrays["cons_name_offsets"]),
+        )
+
+    def write_binary(self, filepath: os.PathLike) -> None:
+        """
+        Write the arrays of the original problem in the binary container format.
+
+        The file holds the arrays of :py:meth:`to_arrays`, and the names of
+        the problem, variables, and constraints. The arrays can be read back
+        (or memory-mapped) without SCIP with :py:meth:`read_binary_arrays`.
+        The file is not meant to be loaded back as a model: building a model
+        from arrays takes one PySCIPOpt call per variable and constraint,
+        which is no faster than SCIP parsing the original instance.
+        Only linear problems are supported, before they are transformed.
+        """
+        write_arrays(filepath, *self._export())
+
+    @staticmethod
+    def read_binary_arrays(filepath: os.PathLike, mmap: bool = False
+                           ) -> Dict[str, np.ndarray]:
+        """
+        Read the arrays of a binary container file, as returned by :py:meth:`to_arrays`.
+
+        With `mmap`, arrays are read-only memory maps of the file, so that
+        statistics of large instances can be computed without loading them.
+        """
+        arrays, _ = read_arrays(filepath, mmap)
+        for key in ("var_names", "var_name_offsets", "cons_names", "cons_name_offsets"):
+            arrays.pop(key)
+        return arrays
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        Serialize the original problem into a compact buffer of arrays.
+
+        The buffer has the layout of the binary container format. Parameters
+        that differ from their default value are kept, as well as the cached
+        fingerprints. Only linear problems can be pickled, before they are
+        transformed.
+        """
+        arrays, metadata = self._export()
+        defaults = _default_params()
+        metadata["params"] = {name: value for name, value in self.get_params().items()
+                              if defaults.get(name) != value}
+        return {"buffer": pack_arrays(arrays, metadata, bytearray),
+                "fingerprints": self.fingerprints}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        arrays, metadata = unpack_arrays(state["buffer"])
+        model = Model._import(arrays, metadata)
+        model.set_params(metadata["params"])
+        self.model = model.model
+        self.fingerprints = state["fingerprints"]
+
+    def share(self) -> "SharedModel":
+        """
+        Place the original problem in shared memory.
+
+        Returns a :py:class:`SharedModel`, a small picklable handle that other
+        processes use to load the problem without copying it through pipes or
+        files.
+        """
+        from .shared import SharedModel
+        return SharedModel(self)
+
     def get_param(self, name: str) -> Union[bool, int, float, str]:
         return self.model.get_param(name)
     
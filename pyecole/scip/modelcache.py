@@ -0,0 +1,71 @@
+"""In-process cache of parsed instance files."""
+
+import os
+from ..cache import LRUCache
+from .model import Model
+from typing import *
+
+
+class ModelCache:
+    """
+    Cache of the original problems read from instance files.
+
+    Files are read with `Model.from_file` once, and every request returns a
+    fresh `copy_orig` of the parsed problem, so that cached problems are never
+    modified. The fingerprint of a problem is computed once, the first time
+    it is requested on one of its copies, before the copy is modified or
+    transformed. Entries are keyed by the absolute path, the
+    modification time, and the size of the file, so that modified files are
+    read again.
+    The least recently used problems are evicted when the total size of their
+    files exceeds the memory budget, or when there are too many of them.
+    """
+    def __init__(self, max_bytes: int = 2 ** 30, max_models: int = 1024) -> None:
+        """
+        Create an empty cache.
+
+        Parameters
+        ----------
+        max_bytes:
+            Budget on the total size of the cached instance files, used as a
+            proxy for the memory of the parsed problems.
+        max_models:
+            Maximum number of cached problems.
+        """
+        self.cache = LRUCache(max_models, max_bytes)
+        self.keys = {}
+        self.n_hits = 0
+        self.n_misses = 0
+
+    def __len__(self) -> int:
+        return len(self.cache)
+
+    def get(self, filepath: os.PathLike) -> Model:
+        """
+        Return a copy of the original problem of the file, reading it if needed.
+        """
+        path = os.path.abspath(filepath)
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        model = self.cache.get(key)
+        if model is None:
+            self.n_misses += 1
+            model = Model.from_file(path)
+            # Entries of previous versions of the file are useless
+            self.cache.pop(self.keys.get(path))
+            self.keys[path] = key
+            self.cache.put(key, model, stat.st_size)
+        else:
+            self.n_hits += 1
+        copy = model.copy_orig()
+        # Shared with the cached problem, so that its fingerprint is only computed when first
+        # requested on one of the copies, and then reused by all of them
+        copy.fingerprints = model.fingerprints
+        return copy
+
+    def clear(self) -> None:
+        """
+        Remove all cached problems.
+        """
+        self.cache.clear()
+        self.keys.clear()
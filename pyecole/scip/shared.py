@@ -0,0 +1,86 @@
+"""Transfer of models between processes through shared memory."""
+
+import numpy as np
+from multiprocessing import shared_memory
+from .binary import pack_arrays, unpack_arrays
+from .model import Model
+from typing import *
+
+
+class SharedModel:
+    """
+    Handle of the original problem of a model placed in shared memory.
+
+    The problem arrays are written once into a shared memory block, with the
+    layout of the binary container format. The handle only pickles the name of
+    the block, so it can be sent to other processes (e.g. through a
+    `multiprocessing.Queue`), which rebuild the model with `load` without any
+    disk I/O.
+
+    The process that created the handle owns the block, and must release it
+    with `unlink` (or by using the handle as a context manager) once every
+    process has loaded the model. Loading processes are expected to be
+    started by `multiprocessing`, so that they share the resource tracker of
+    the owner.
+    """
+    def __init__(self, model: Model) -> None:
+        """
+        Copy the original problem of `model` into a new shared memory block.
+        """
+        arrays, metadata = model._export()
+        pack_arrays(arrays, metadata, self._allocate)
+        self.name = self.memory.name
+        self.fingerprints = dict(model.fingerprints)
+        self.owner = True
+
+    def _allocate(self, size: int) -> shared_memory.SharedMemory:
+        self.memory = shared_memory.SharedMemory(create=True, size=size)
+        return self.memory.buf
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"name": self.name, "fingerprints": self.fingerprints}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.name = state["name"]
+        self.fingerprints = state["fingerprints"]
+        self.memory = None
+        self.owner = False
+
+    def load(self) -> Model:
+        """
+        Create a model from the shared problem.
+        """
+        if self.memory is not None:
+            memory = self.memory
+        else:
+            memory = shared_memory.SharedMemory(name=self.name)
+        try:
+            views, metadata = unpack_arrays(memory.buf)
+            # Copied out, so that no view of the block outlives it (e.g. in a traceback)
+            arrays = {name: np.array(view) for name, view in views.items()}
+            del views
+        finally:
+            if memory is not self.memory:
+                try:
+                    memory.close()
+                except BufferError:
+                    # Views are still referenced by the exception being raised
+                    pass
+        model = Model._import(arrays, metadata)
+        model.fingerprints = dict(self.fingerprints)
+        return model
+
+    def unlink(self) -> None:
+        """
+        Release the shared memory block. Only effective in the owner process.
+        """
+        if self.owner and self.memory is not None:
+            self.memory.close()
+            self.memory.unlink()
+            self.memory = None
+
+    def __enter__(self) -> "SharedModel":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.unlink()
@@ -0,0 +1,144 @@
+"""Pools of primal solutions shared across episodes."""
+
+import os
+import ecole.scip
+import numpy as np
+from .scip import Model
+from typing import *
+
+
+class SolutionPool:
+    """
+    Bounded pools of the best known solutions of instances.
+
+    Every instance, identified by its fingerprint, has its own pool of at most
+    `max_solutions` solutions, stored as a vector of objective values and a
+    matrix with the value of every original variable for every solution.
+    Solutions can be collected from solved (or partially solved) models and
+    added as starting solutions to new models of the same instance.
+    """
+    def __init__(self, max_solutions: int = 10) -> None:
+        """
+        Create empty pools.
+
+        Parameters
+        ----------
+        max_solutions:
+            Maximum number of solutions kept per instance.
+        """
+        self.max_solutions = max_solutions
+        self.pools = {}
+
+    def __len__(self) -> int:
+        return len(self.pools)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.pools
+
+    def get(self, key: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Return the objective values and variable values of the pool of `key`, best first.
+        """
+        return self.pools.get(key)
+
+    def add(self, key: str, objectives: np.ndarray, values: np.ndarray,
+            maximize: bool = False) -> None:
+        """
+        Add solutions to the pool of `key`, keeping the best distinct ones.
+
+        Parameters
+        ----------
+        key:
+            The fingerprint of the instance.
+        objectives:
+            The objective value of every solution.
+        values:
+            A matrix with one row of original variable values per solution.
+        maximize:
+            Whether larger objective values are better.
+        """
+        objectives = np.asarray(objectives, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64).reshape(len(objectives), -1)
+        if key in self.pools:
+            objectives = np.concatenate((self.pools[key][0], objectives))
+            values = np.concatenate((self.pools[key][1], values))
+        _, distinct = np.unique(values, axis=0, return_index=True)
+        order = distinct[np.argsort(-objectives[distinct] if maximize
+                                    else objectives[distinct], kind="stable")]
+        order = order[:self.max_solutions]
+        self.pools[key] = (objectives[order], values[order])
+
+    def collect(self, model: Model, key: Optional[str] = None) -> None:
+        """
+        Add the solutions found in `model` to its pool.
+
+        Parameters
+        ----------
+        model:
+            A model whose solving has started.
+        key:
+            The fingerprint of the instance of `model`. It must be given once
+            the problem is transformed, since the fingerprint describes the
+            original problem.
+        """
+        if model.stage in (ecole.scip.Stage.Init, ecole.scip.Stage.Problem):
+            return
+        key = model.fingerprint() if key is None else key
+        if key is None:
+            return
+        scip = model.as_pyscipopt()
+        solutions = scip.getSols()[:self.max_solutions]
+        if len(solutions) == 0:
+            return
+        variables = scip.getVars()
+        objectives = np.array([scip.getSolObjVal(solution) for solution in solutions])
+        values = np.array([[scip.getSolVal(solution, var) for var in variables]
+                           for solution in solutions])
+        self.add(key, objectives, values, scip.getObjectiveSense() == "maximize")
+
+    def warm_start(self, model: Model, key: Optional[str] = None) -> int:
+        """
+        Add the solutions of the pool of the instance to `model` as starting solutions.
+
+        The model must not be transformed yet. Returns the number of solutions added.
+        """
+        key = model.fingerprint() if key is None else key
+        if key is None or key not in self.pools:
+            return 0
+        scip = model.as_pyscipopt()
+        variables = scip.getVars()
+        _, values = self.pools[key]
+        if values.shape[1] != len(variables):
+            return 0
+        for row in values:
+            solution = scip.createSol()
+            for var, value in zip(variables, row):
+                scip.setSolVal(solution, var, value)
+            scip.addSol(solution)
+        return len(values)
+
+    def save(self, filepath: os.PathLike) -> None:
+        """
+        Save the pools to a `.npz` file.
+        """
+        arrays = {}
+        for index, (key, (objectives, values)) in enumerate(self.pools.items()):
+            arrays[f"key_{index}"] = np.array(key)
+            arrays[f"objectives_{index}"] = objectives
+            arrays[f"values_{index}"] = values
+        np.savez_compressed(filepath, max_solutions=self.max_solutions, **arrays)
+
+    @staticmethod
+    def load(filepath: os.PathLike) -> "SolutionPool":
+        """
+        Load pools saved with `save`.
+        """
+        with np.load(filepath) as stored:
+            pool = SolutionPool(int(stored["max_solutions"]))
+            index = 0
+            while f"key_{index}" in stored:
+                pool.pools[str(stored[f"key_{index}"])] = (
+                    stored[f"objectives_{index}"], stored[f"values_{index}"]
+                )
+                index += 1
+        return pool
@@ -0,0 +1,107 @@
+import os
+import pickle
+import sqlite3
+import time
+from typing import *
+
+
+class KeyValueStore:
+    """
+    Persistent mapping from string keys to picklable values.
+
+    The store is a single SQLite database file, so it needs no server, survives
+    across processes and runs, and looks keys up through the primary key index.
+    When the total size of the stored values exceeds `max_size`, the least
+    recently used entries are evicted.
+    """
+    def __init__(self, filepath: os.PathLike,
+                 max_size: Optional[int] = None) -> None:
+        """
+        Open (or create) the store.
+
+        Parameters
+        ----------
+        filepath:
+            Path of the database file.
+        max_size:
+            Maximum total size in bytes of the pickled values (no limit by
+            default).
+        """
+        self.filepath = os.fspath(filepath)
+        self.max_size = max_size
+        self.connection = sqlite3.connect(self.filepath)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+            "size INTEGER NOT NULL, accessed REAL NOT NULL)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)"
+        )
+        self.connection.commit()
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def __contains__(self, key: str) -> bool:
+        return self.connection.execute(
+            "SELECT 1 FROM entries WHERE key = ?", (key,)
+        ).fetchone() is not None
+
+    def keys(self) -> List[str]:
+        return [row[0] for row in self.connection.execute("SELECT key FROM entries")]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Return the value stored for `key`, or `default` if there is none.
+        """
+        row = self.connection.execute(
+            "SELECT value FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return default
+        if self.max_size is not None:
+            self.connection.execute(
+                "UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+            self.connection.commit()
+        return pickle.loads(row[0])
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Store `value` for `key`, replacing any previous value.
+        """
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self.connection.execute(
+            "INSERT OR REPLACE INTO entries (key, value, size, accessed) "
+            "VALUES (?, ?, ?, ?)", (key, blob, len(blob), time.time())
+        )
+        if self.max_size is not None:
+            self._evict(self.max_size)
+        self.connection.commit()
+
+    @property
+    def size(self) -> int:
+        """
+        Total size in bytes of the pickled values.
+        """
+        return self.connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+
+    def _evict(self, max_size: int) -> None:
+        """Delete the least recently used entries until the total size fits in `max_size`."""
+        excess = self.size - max_size
+        if excess <= 0:
+            return
+        evicted = []
+        for key, size in self.connection.execute(
+                "SELECT key, size FROM entries ORDER BY accessed"):
+            if excess <= 0:
+                break
+            evicted.append((key,))
+            excess -= size
+        self.connection.executemany("DELETE FROM entries WHERE key = ?", evicted)
+
+    def close(self) -> None:
+        self.connection.close()
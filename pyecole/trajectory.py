@@ -0,0 +1,201 @@
+"""Array-backed accumulation of episode trajectories."""
+
+import numpy as np
+from .buffer import RecordBuffer
+from typing import *
+
+# Number of time steps processed at once when discounting. Powers of the
+# discount factor are only taken up to this exponent, which keeps them clear of
+# underflow for any reasonable discount factor.
+_BLOCK_SIZE = 64
+
+
+def discounted_cumsum(values: np.ndarray, discount: float,
+                      final: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Compute discounted sums of future values for many sequences at once.
+
+    The result `out` satisfies `out[:, t] = values[:, t] + discount * out[:, t + 1]`,
+    with `out[:, T] = final`. It is computed with one matrix product per block
+    of time steps instead of one Python iteration per time step.
+
+    Parameters
+    ----------
+    values:
+        A matrix with one sequence per row. Sequences of different lengths
+        should be aligned on their end (padded with zeros at the start).
+    discount:
+        The discount factor.
+    final:
+        The value following the end of every sequence (zero by default).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n_sequences, length = values.shape
+    out = np.empty_like(values)
+    carry = (np.zeros(n_sequences) if final is None
+             else np.asarray(final, dtype=np.float64))
+    offsets = np.arange(_BLOCK_SIZE)
+    # weights[j, i] = discount ** (j - i) for j >= i
+    weights = np.tril(np.power(discount, np.maximum(offsets[:, None] - offsets[None, :], 0)))
+    for end in range(length, 0, -_BLOCK_SIZE):
+        start = max(end - _BLOCK_SIZE, 0)
+        size = end - start
+        block = values[:, start:end] @ weights[:size, :size]
+        out[:, start:end] = block + carry[:, None] * np.power(discount, size - offsets[:size])
+        carry = out[:, start]
+    return out
+
+
+class Trajectory:
+    """
+    Growable record of the rewards, done flags and value estimates of episodes.
+
+    Transitions are appended into preallocated NumPy buffers, and returns and
+    advantages are computed for all recorded episodes at once.
+    The trajectory can be filled by hand, or passed to an `Environment` which
+    then starts a new episode on every `reset` and appends every `step`.
+    """
+    dtype = np.dtype([("episode", np.int64),
+                      ("reward", np.float64),
+                      ("done", np.bool_),
+                      ("value", np.float64)])
+
+    def __init__(self, capacity: int = 4096) -> None:
+        """
+        Create an empty trajectory.
+
+        Parameters
+        ----------
+        capacity:
+            Number of transitions initially allocated.
+        """
+        self.buffer = RecordBuffer(Trajectory.dtype, capacity)
+        self.bootstrap_values = []
+        self.pending_value = np.nan
+
+    def __len__(self) -> int:
+        return len(self.buffer)
+
+    @property
+    def n_episodes(self) -> int:
+        return len(self.bootstrap_values)
+
+    def start_episode(self) -> None:
+        """
+        Start a new episode. Following transitions are appended to it.
+        """
+        self.bootstrap_values.append(0.0)
+        self.pending_value = np.nan
+
+    def record_value(self, value: float) -> None:
+        """
+        Record the value estimate of the current state.
+
+        The estimate is attached to the next transition appended, *i.e.* the one
+        leaving the current state. If the episode is truncated instead, use
+        `set_bootstrap_value`.
+        """
+        self.pending_value = value
+
+    def set_bootstrap_value(self, value: float) -> None:
+        """
+        Set the value estimate of the state reached at the end of the current
+        episode, used when the episode was truncated before a terminal state.
+        """
+        self.bootstrap_values[-1] = value
+
+    def append(self, reward: float, done: bool,
+               value: Optional[float] = None) -> None:
+        """
+        Append a transition to the current episode.
+
+        Parameters
+        ----------
+        reward:
+            The reward of the transition.
+        done:
+            Whether the transition reached a terminal state.
+        value:
+            The value estimate of the state the transition left. Defaults to the
+            value given to `record_value`, or `NaN`.
+        """
+        if self.n_episodes == 0:
+            self.start_episode()
+        if value is None:
+            value = self.pending_value
+        self.buffer.append(self.n_episodes - 1, reward, done, value)
+        self.pending_value = np.nan
+
+    @property
+    def episode(self) -> np.ndarray:
+        return self.buffer["episode"]
+
+    @property
+    def reward(self) -> np.ndarray:
+        return self.buffer["reward"]
+
+    @property
+    def done(self) -> np.ndarray:
+        return self.buffer["done"]
+
+    @property
+    def value(self) -> np.ndarray:
+        return self.buffer["value"]
+
+    def _padded(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Lay out per-transition values in a matrix with one end-aligned episode per row."""
+        episode = self.episode
+        lengths = np.bincount(episode, minlength=self.n_episodes)
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        width = max(int(lengths.max(initial=0)), 1)
+        columns = width - lengths[episode] + (np.arange(len(episode)) - starts[episode])
+        matrix = np.zeros((self.n_episodes, width))
+        matrix[episode, columns] = values
+        return matrix, columns
+
+    def _final_values(self) -> np.ndarray:
+        """Value of the state following the last transition of every episode."""
+        final = np.array(self.bootstrap_values, dtype=np.float64)
+        last = np.flatnonzero(np.diff(self.episode, append=-1) != 0)
+        ended = np.zeros(self.n_episodes, dtype=bool)
+        ended[self.episode[last]] = self.done[last]
+        final[ended] = 0.0
+        return final
+
+    def returns(self, discount: float = 1.0) -> np.ndarray:
+        """
+        Compute the discounted return following every transition.
+
+        Truncated episodes are bootstrapped with the value given to
+        `set_bootstrap_value` (zero by default).
+        """
+        matrix, columns = self._padded(self.reward)
+        out = discounted_cumsum(matrix, discount, self._final_values())
+        return out[self.episode, columns]
+
+    def advantages(self, discount: float = 1.0,
+                   gae_lambda: float = 1.0) -> np.ndarray:
+        """
+        Compute the generalized advantage estimate (GAE) of every transition.
+
+        Requires the value estimates of all states to have been recorded.
+        Adding the value estimates to the advantages gives the
+        :math:`\\lambda`-returns, typically used as targets for the value function.
+        """
+        value = self.value
+        next_value = np.empty_like(value)
+        next_value[:-1] = value[1:]
+        last = np.diff(self.episode, append=-1) != 0
+        next_value[last] = self._final_values()[self.episode[last]]
+        deltas = self.reward + discount * next_value - value
+        matrix, columns = self._padded(deltas)
+        out = discounted_cumsum(matrix, discount * gae_lambda)
+        return out[self.episode, columns]
+
+    def clear(self) -> None:
+        """
+        Remove all episodes, keeping the allocated capacity.
+        """
+        self.buffer.clear()
+        self.bootstrap_values = []
+        self.pending_value = np.nan
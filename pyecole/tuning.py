@@ -0,0 +1,187 @@
+"""Search of SCIP parameters over collections of instances."""
+
+import json
+import math
+import os
+import numpy as np
+from .environment import Configuring
+from .information.solverstats import SolverStats
+from .parallel import instance_files, imap_instances
+from .reward import SolvingTime
+from .store import KeyValueStore
+from typing import *
+
+
+def _evaluate(task) -> Dict[str, Any]:
+    filepath, configuration, time_limit, scip_params, seed = task
+    env = Configuring(reward_function=SolvingTime(),
+                      information_function=SolverStats(),
+                      scip_params={**scip_params, "limits/time": time_limit})
+    env.seed(seed)
+    env.reset(filepath)
+    _, _, solving_time, _, stats = env.step(configuration)
+    return {"solving_time": float(solving_time),
+            "solved": bool(env.model.is_solved),
+            "gap": float(stats["gap"])}
+
+
+def _python_value(value: Any) -> Union[bool, int, float, str]:
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class SuccessiveHalving:
+    """
+    Successive-halving search of SCIP parameters with the `Configuring` environment.
+
+    Many configurations are sampled from a parameter space and evaluated on a
+    small subset of the instances with a tight time limit. Only the best
+    fraction `1 / eta` of them is promoted to the next rung, where the number
+    of instances and the time limit are multiplied by `eta`, until a single
+    configuration remains or all instances are used.
+
+    Configurations are scored by their mean penalized solving time: unsolved
+    instances count as `penalty` times the time limit. Evaluations run in a
+    pool of processes and are checkpointed in a `KeyValueStore`, so that an
+    interrupted search resumes where it stopped when run again with the same
+    arguments.
+    """
+    def __init__(self, space: Dict[str, Union[Sequence[Any], Callable[[np.random.Generator], Any]]],
+                 source: Union[os.PathLike, Iterable[os.PathLike]],
+                 checkpoint: os.PathLike,
+                 n_configurations: int = 27,
+                 eta: int = 3,
+                 min_instances: int = 1,
+                 time_limit: float = 10.0,
+                 max_time_limit: Optional[float] = None,
+                 penalty: float = 10.0,
+                 scip_params: Optional[Dict[str, Union[bool, int, float, str]]] = None,
+                 seed: int = 0,
+                 n_jobs: Optional[int] = None) -> None:
+        """
+        Create a search.
+
+        Parameters
+        ----------
+        space:
+            The parameter space, mapping every parameter name to either a
+            sequence of values to choose from, or a callable sampling a value
+            from a `numpy.random.Generator`.
+        source:
+            A directory of instances, an instance file, or an iterable of
+            instance files.
+        checkpoint:
+            Path of the database file where evaluations are stored.
+        n_configurations:
+            Number of configurations sampled for the first rung.
+        eta:
+            Reduction factor of the number of configurations between rungs.
+        min_instances:
+            Number of instances of the first rung.
+        time_limit:
+            Time limit in seconds of the solves of the first rung.
+        max_time_limit:
+            Upper bound of the time limit of later rungs (no bound by default).
+        penalty:
+            Multiple of the time limit counted for unsolved instances.
+        scip_params:
+            Parameters set on every model, under the sampled configuration.
+        seed:
+            Seed of the sampling of configurations and instances, and of the
+            environment.
+        n_jobs:
+            Number of worker processes. Defaults to the number of CPUs.
+        """
+        self.space = space
+        self.paths = instance_files(source)
+        self.store = KeyValueStore(checkpoint)
+        self.n_configurations = n_configurations
+        self.eta = eta
+        self.min_instances = min_instances
+        self.time_limit = time_limit
+        self.max_time_limit = max_time_limit
+        self.penalty = penalty
+        self.scip_params = scip_params if scip_params is not None else {}
+        self.seed = seed
+        self.n_jobs = n_jobs
+        self.history = []
+        self.errors = {}
+
+    def sample_configurations(self, rng: np.random.Generator
+                              ) -> List[Dict[str, Union[bool, int, float, str]]]:
+        """
+        Sample the configurations of the first rung from the parameter space.
+        """
+        configurations = []
+        for _ in range(self.n_configurations):
+            configuration = {}
+            for name, values in self.space.items():
+                if callable(values):
+                    value = values(rng)
+                else:
+                    value = values[rng.integers(len(values))]
+                configuration[name] = _python_value(value)
+            configurations.append(configuration)
+        return configurations
+
+    def _key(self, path: str, configuration: Dict[str, Any], time_limit: float) -> str:
+        return json.dumps([os.path.abspath(path), configuration, time_limit,
+                           self.scip_params, self.seed], sort_keys=True)
+
+    def _score(self, result: Optional[Dict[str, Any]], time_limit: float) -> float:
+        if result is None or not result["solved"]:
+            return self.penalty * time_limit
+        return result["solving_time"]
+
+    def evaluate(self, configurations: List[Dict[str, Any]], paths: List[str],
+                 time_limit: float) -> np.ndarray:
+        """
+        Return the mean penalized solving time of every configuration on the instances.
+
+        Evaluations found in the checkpoint are not solved again. Failed
+        evaluations count as unsolved and are recorded in `errors`.
+        """
+        tasks = [(path, configuration, time_limit, self.scip_params, self.seed)
+                 for configuration in configurations for path in paths]
+        keys = [self._key(path, configuration, time_limit)
+                for path, configuration, *_ in tasks]
+        pending = [i for i, key in enumerate(keys) if key not in self.store]
+        for index, result, error in imap_instances(_evaluate,
+                                                   [tasks[i] for i in pending],
+                                                   n_jobs=self.n_jobs):
+            if error is None:
+                self.store.put(keys[pending[index]], result)
+            else:
+                self.errors[keys[pending[index]]] = error
+        scores = np.array([self._score(self.store.get(key), time_limit)
+                           for key in keys])
+        return scores.reshape(len(configurations), len(paths)).mean(axis=1)
+
+    def run(self) -> Dict[str, Union[bool, int, float, str]]:
+        """
+        Run the search and return the best configuration.
+
+        The configurations, scores, number of instances, and time limit of
+        every rung are recorded in `history`.
+        """
+        rng = np.random.default_rng(self.seed)
+        configurations = self.sample_configurations(rng)
+        paths = [self.paths[i] for i in rng.permutation(len(self.paths))]
+        self.history = []
+        n_instances = self.min_instances
+        time_limit = self.time_limit
+        while True:
+            n_instances = min(n_instances, len(paths))
+            scores = self.evaluate(configurations, paths[:n_instances], time_limit)
+            self.history.append({"configurations": configurations,
+                                 "scores": scores,
+                                 "n_instances": n_instances,
+                                 "time_limit": time_limit})
+            order = np.argsort(scores, kind="stable")
+            if len(configurations) == 1 or n_instances == len(paths):
+                return configurations[order[0]]
+            n_promoted = max(math.ceil(len(configurations) / self.eta), 1)
+            configurations = [configurations[i] for i in order[:n_promoted]]
+            n_instances *= self.eta
+            time_limit *= self.eta
+            if self.max_time_limit is not None:
+                time_limit = min(time_limit, self.max_time_limit)
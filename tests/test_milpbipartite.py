@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("ecole")
+
+import pyecole.environment
+import pyecole.instance
+from pyecole.observation import MilpBipartite
+
+
+class CountingFunction:
+    """Wrap an Ecole observation function and count its extractions."""
+
+    def __init__(self, func):
+        self.func = func
+        self.n_extractions = 0
+
+    def before_reset(self, model):
+        self.func.before_reset(model)
+
+    def extract(self, model, done):
+        self.n_extractions += 1
+        return self.func.extract(model, done)
+
+
+def test_memoized_across_resets():
+    observation_function = MilpBipartite(memoize=True)
+    observation_function.func = counting = CountingFunction(observation_function.func)
+    env = pyecole.environment.Branching(
+        observation_function=observation_function,
+        scip_params={"randomization/permuteconss": False,
+                     "randomization/permutevars": False},
+    )
+    instance = next(pyecole.instance.SetCoverGenerator())
+
+    first, *_ = env.reset(instance)
+    second, *_ = env.reset(instance)
+
+    assert counting.n_extractions == 1
+    assert len(observation_function.cache) == 1
+    np.testing.assert_array_equal(first.variable_features, second.variable_features)
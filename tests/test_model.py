@@ -0,0 +1,86 @@
+import pickle
+import numpy as np
+import pytest
+
+pytest.importorskip("ecole")
+pytest.importorskip("pyscipopt")
+
+from pyecole.scip import Model
+
+
+def dense(arrays):
+    """Dense constraint matrix of the arrays of a problem."""
+    matrix = np.zeros((len(arrays["indptr"]) - 1, len(arrays["c"])))
+    for i, (start, end) in enumerate(zip(arrays["indptr"][:-1], arrays["indptr"][1:])):
+        np.add.at(matrix[i], arrays["indices"][start:end], arrays["data"][start:end])
+    return matrix
+
+
+def problem_arrays(maximize=True):
+    # The first row holds a duplicate entry for variable 0
+    return {
+        "matrix": (np.array([0, 3, 5]), np.array([0, 2, 0, 1, 2]),
+                   np.array([1.0, 2.0, 0.5, -1.0, 4.0])),
+        "row_lb": np.array([-np.inf, 1.0]),
+        "row_ub": np.array([10.0, np.inf]),
+        "c": np.array([1.0, -2.0, 3.0]),
+        "var_lb": np.array([0.0, -np.inf, 0.0]),
+        "var_ub": np.array([1.0, 5.0, np.inf]),
+        "vtypes": np.array([0, 1, 3]),
+        "maximize": maximize,
+    }
+
+
+@pytest.mark.parametrize("maximize", [False, True])
+def test_from_arrays_round_trip(maximize):
+    arrays = problem_arrays(maximize)
+    result = Model.from_arrays(**arrays).to_arrays()
+
+    indptr, indices, data = arrays["matrix"]
+    expected = dense({"indptr": indptr, "indices": indices, "data": data, "c": arrays["c"]})
+    np.testing.assert_array_equal(dense(result), expected)
+    # Duplicate entries are summed into one coefficient
+    assert len(result["data"]) == 4
+    np.testing.assert_array_equal(result["row_lb"], [-1e20, 1.0])
+    np.testing.assert_array_equal(result["row_ub"], [10.0, 1e20])
+    np.testing.assert_array_equal(result["c"], arrays["c"])
+    np.testing.assert_array_equal(result["var_lb"], [0.0, -1e20, 0.0])
+    np.testing.assert_array_equal(result["var_ub"], [1.0, 5.0, 1e20])
+    np.testing.assert_array_equal(result["vtypes"], arrays["vtypes"])
+    assert bool(result["maximize"]) == maximize
+
+
+def test_from_arrays_of_to_arrays():
+    arrays = Model.from_arrays(**problem_arrays()).to_arrays()
+    matrix = (arrays.pop("indptr"), arrays.pop("indices"), arrays.pop("data"))
+    maximize = bool(arrays.pop("maximize"))
+    copy = Model.from_arrays(matrix, maximize=maximize, **arrays).to_arrays()
+    for key, value in Model.from_arrays(**problem_arrays()).to_arrays().items():
+        np.testing.assert_array_equal(copy[key], value)
+
+
+def test_pickle_round_trip():
+    model = Model.from_arrays(**problem_arrays())
+    model.set_param("limits/time", 10.0)
+    copy = pickle.loads(pickle.dumps(model))
+    for key, value in model.to_arrays().items():
+        np.testing.assert_array_equal(copy.to_arrays()[key], value)
+    assert copy.get_param("limits/time") == 10.0
+    assert copy.fingerprint() == model.fingerprint()
+
+
+def test_shared_model_load():
+    model = Model.from_arrays(**problem_arrays())
+    with model.share() as shared:
+        copy = pickle.loads(pickle.dumps(shared)).load()
+    for key, value in model.to_arrays().items():
+        np.testing.assert_array_equal(copy.to_arrays()[key], value)
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_binary_arrays_round_trip(tmp_path, mmap):
+    model = Model.from_arrays(**problem_arrays())
+    model.write_binary(tmp_path / "model.milp")
+    arrays = Model.read_binary_arrays(tmp_path / "model.milp", mmap=mmap)
+    for key, value in model.to_arrays().items():
+        np.testing.assert_array_equal(arrays[key], value)